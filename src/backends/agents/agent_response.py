@@ -4,7 +4,7 @@ Standard response model for all agents.
 
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class AgentResponse(BaseModel):
@@ -16,3 +16,5 @@ class AgentResponse(BaseModel):
     timestamp: str = Field(..., description="ISO timestamp of the response")
     status: str = Field(default="success", description="Status of the response")
     metadata: dict[str, Any] = Field(default_factory=dict, description="Additional response metadata")
+
+    model_config = ConfigDict(extra="forbid", validate_assignment=False)
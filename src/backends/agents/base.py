@@ -3,6 +3,7 @@ Base Agent Interface
 """
 
 import asyncio
+import random
 from abc import ABC, abstractmethod
 from collections.abc import AsyncGenerator
 from typing import Any
@@ -10,12 +11,50 @@ from typing import Any
 from loguru import logger
 from ..sessions.session import Session
 
+# Dedicated generator for cosmetic choices, so they don't touch the global random state
+_rng = random.Random()
+
+# How long a "still connected" answer from is_disconnected is reused before polling again
+DISCONNECT_CHECK_TTL = 0.05
+
+# Events buffered between the agent and the HTTP writer; progress events are dropped when full
+STREAM_QUEUE_SIZE = 64
+_STREAM_DONE = object()
+
+
+def progress_event(message: str) -> dict[str, Any]:
+    """
+    Build a progress event for `message`.
+
+    Agents build their static events once at import time and yield them as-is,
+    so the returned dict is shared across requests and must never be mutated.
+    """
+    return {"type": "progress", "data": {"message": message}}
+
+
+class _DisconnectWatch:
+    """The single disconnect watcher of one request, shared by every cancellation monitor on it."""
+
+    __slots__ = ("event", "task", "users")
+
+    def __init__(self, event: asyncio.Event, task: asyncio.Task):
+        self.event = event
+        self.task = task
+        self.users = 0
+
+
+def _is_progress(event: Any) -> bool:
+    return isinstance(event, dict) and event.get("type") == "progress"
+
 
 class BaseAgent(ABC):
     """
     Abstract base class for all agents.
     """
 
+    # Keeps the base layout-free so subclasses can opt into __slots__
+    __slots__ = ()
+
     @abstractmethod
     async def stream_response(
         self,
@@ -63,7 +102,7 @@ class BaseAgent(ABC):
         pass
 
     # can generate more during streaming 🤗
-    COZY_MESSAGES = [
+    COZY_MESSAGES = (
         "Brewing some thoughts... ☕️",
         "Sketching out an answer... ✍️",
         "Composing a reply... 🎵",
@@ -95,19 +134,96 @@ class BaseAgent(ABC):
         "Just turning the page... 📖",
         "Highlighting a key passage... 🖍️",
         "Finding the right chapter... 🔖",
-    ]
+    )
+    # Prebuilt progress events, one per message
+    COZY_PROGRESS_EVENTS = tuple(progress_event(msg) for msg in COZY_MESSAGES)
+
+    def random_cozy_message(self) -> str:
+        """Pick a random message from COZY_MESSAGES for a progress update."""
+        return _rng.choice(self.COZY_MESSAGES)
+
+    def random_cozy_progress(self) -> dict[str, Any]:
+        """Pick a random prebuilt progress event from COZY_PROGRESS_EVENTS."""
+        return _rng.choice(self.COZY_PROGRESS_EVENTS)
 
     async def is_disconnected(self, request: Any | None) -> bool:
         """Return True if the client has disconnected, else False."""
         if request is None:
             return False
+
+        # Disconnects are final, and a recent "connected" answer is reused for a short TTL
+        now = asyncio.get_running_loop().time()
+        cached = getattr(request, "_chiken_disc_cache", None)
+        if cached is not None:
+            checked_at, disconnected = cached
+            if disconnected or now - checked_at < DISCONNECT_CHECK_TTL:
+                return disconnected
+
         try:
             checker = getattr(request, "is_disconnected", None)
             if checker is None:
                 return False
-            return bool(await checker())
+            disconnected = bool(await checker())
         except Exception:
-            return True
+            disconnected = True
+
+        try:
+            request._chiken_disc_cache = (now, disconnected)
+        except AttributeError:
+            pass
+        return disconnected
+
+    async def wait_for_disconnect(self, request: Any) -> None:
+        """
+        Return once the client behind `request` has disconnected.
+
+        ASGI requests are watched through their `receive` channel, which only wakes up
+        when a message arrives. Request objects without one fall back to polling
+        `is_disconnected`. Reading `receive` takes the message from any other reader,
+        so monitors share one call per request through `_acquire_disconnect_watch`.
+        """
+        receive = getattr(request, "receive", None)
+        if receive is None:
+            while not await self.is_disconnected(request):
+                await asyncio.sleep(0.1)
+            return
+
+        try:
+            while True:
+                message = await receive()
+                if message.get("type") == "http.disconnect":
+                    return
+        except Exception:
+            # A broken receive channel means the client is gone
+            return
+
+    def _acquire_disconnect_watch(self, request: Any) -> _DisconnectWatch:
+        """Return the disconnect watcher of `request`, starting it for the first monitor."""
+        watch = getattr(request, "_chiken_disconnect_watch", None)
+        if watch is None:
+            event = asyncio.Event()
+
+            async def watch_request():
+                await self.wait_for_disconnect(request)
+                event.set()
+
+            watch = _DisconnectWatch(event, asyncio.create_task(watch_request()))
+            try:
+                request._chiken_disconnect_watch = watch
+            except AttributeError:
+                # Not shareable; this monitor owns the watcher alone
+                pass
+        watch.users += 1
+        return watch
+
+    def _release_disconnect_watch(self, request: Any, watch: _DisconnectWatch) -> None:
+        """Drop one monitor's use of `watch`, stopping the watcher once no monitor needs it."""
+        watch.users -= 1
+        if watch.users > 0:
+            return
+        watch.task.cancel()
+        if getattr(request, "_chiken_disconnect_watch", None) is watch:
+            del request._chiken_disconnect_watch
 
     def create_cancellation_monitor(self, request: Any | None = None, external_event: asyncio.Event | None = None) -> tuple[asyncio.Event, asyncio.Task | None]:
         """
@@ -133,24 +249,26 @@ class BaseAgent(ABC):
             return cancellation_event, None
             
         async def monitor_cancellation():
-            """Monitor request disconnection and external cancellation events."""
+            """Wait for request disconnection, external cancellation, or cleanup, whichever comes first."""
+            watch = self._acquire_disconnect_watch(request) if request else None
+            disconnect_task = asyncio.create_task(watch.event.wait()) if watch else None
+            external_task = asyncio.create_task(external_event.wait()) if external_event else None
+            cleanup_task = asyncio.create_task(cancellation_event.wait())
+            waiters = {task for task in (disconnect_task, external_task, cleanup_task) if task is not None}
             try:
-                while not cancellation_event.is_set():
-                    # Check request disconnection
-                    if request and await self.is_disconnected(request):
-                        logger.info("Client disconnected - setting cancellation event")
-                        cancellation_event.set()
-                        break
-                    
-                    # Check external cancellation event
-                    if external_event and external_event.is_set():
-                        logger.info("External cancellation - setting cancellation event")
-                        cancellation_event.set()
-                        break
-                        
-                    await asyncio.sleep(0.1)
+                done, _ = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+                if disconnect_task in done:
+                    logger.info("Client disconnected - setting cancellation event")
+                elif external_task in done:
+                    logger.info("External cancellation - setting cancellation event")
+                cancellation_event.set()
             except Exception as e:
                 logger.warning(f"Error in cancellation monitor: {e}")
+            finally:
+                for task in waiters:
+                    task.cancel()
+                if watch:
+                    self._release_disconnect_watch(request, watch)
         
         monitor_task = asyncio.create_task(monitor_cancellation())
         return cancellation_event, monitor_task
@@ -181,6 +299,65 @@ class BaseAgent(ABC):
         """
         Stream response from the agent.
         The agent implementation should handle request disconnection directly.
+
+        The agent runs as a producer task feeding a bounded queue, so a slow client
+        only stalls the agent once STREAM_QUEUE_SIZE events are waiting. Progress
+        events are dropped rather than waited on when the queue is full, and
+        consecutive queued progress events are sent as one.
         """
-        async for event in self.stream_response(message, session, context, request):
-            yield event
+        queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        finished = False
+
+        async def produce():
+            nonlocal finished
+            try:
+                async for event in self.stream_response(message, session, context, request):
+                    if _is_progress(event):
+                        try:
+                            queue.put_nowait(event)
+                        except asyncio.QueueFull:
+                            pass
+                    else:
+                        await queue.put(event)
+            except Exception as e:
+                await queue.put(e)
+            finally:
+                # Runs on cancellation too and never waits on a full queue; if the sentinel does not
+                # fit, the consumer stops on `finished` once it has drained what is queued
+                finished = True
+                try:
+                    queue.put_nowait(_STREAM_DONE)
+                except asyncio.QueueFull:
+                    pass
+
+        producer = asyncio.create_task(produce())
+        held = None
+        try:
+            while True:
+                if held is not None:
+                    event, held = held, None
+                elif finished and queue.empty():
+                    break
+                else:
+                    event = await queue.get()
+                # Clients only display the latest progress message, so a run of already queued
+                # progress events collapses into its last one
+                while _is_progress(event) and not queue.empty():
+                    following = queue.get_nowait()
+                    if _is_progress(following):
+                        event = following
+                    else:
+                        held = following
+                        break
+                if event is _STREAM_DONE:
+                    break
+                if isinstance(event, Exception):
+                    raise event
+                yield event
+        finally:
+            if not producer.done():
+                producer.cancel()
+                try:
+                    await producer
+                except asyncio.CancelledError:
+                    pass
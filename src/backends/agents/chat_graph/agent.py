@@ -1,5 +1,4 @@
 import asyncio
-import random
 from collections.abc import AsyncGenerator
 from typing import TYPE_CHECKING, Any
 
@@ -7,8 +6,9 @@ from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from loguru import logger
 
 from ...user_config import UserConfig, create_chat_config
-from ..base import BaseAgent
+from ..base import BaseAgent, progress_event
 from .graph import AgentGraphs
+from .memory import should_update_long_term_memory
 from .state import SessionState
 
 if TYPE_CHECKING:
@@ -17,6 +17,23 @@ from ...sessions.session import Session
 
 # logger is imported from loguru
 
+# Token chunks are coalesced before being yielded, flushed once either bound is hit
+STREAM_FLUSH_CHARS = 64
+STREAM_FLUSH_INTERVAL = 0.02
+
+# Caps how many background memory graphs run at once across all sessions
+MAX_CONCURRENT_MEMORY_UPDATES = 4
+_memory_update_semaphore = asyncio.Semaphore(MAX_CONCURRENT_MEMORY_UPDATES)
+# Latest in-flight memory update per session_id and whether it refreshes long-term memory;
+# a newer turn supersedes the older one unless that one is due a summary/entity update
+_pending_memory_updates: dict[str, tuple[asyncio.Task, bool]] = {}
+
+# Static progress events, yielded as-is
+_PROGRESS_READING_DOCUMENTS = progress_event("Reading documents...")
+_PROGRESS_READING_KNOWLEDGE_BASES = progress_event("Reading knowledge bases...")
+_PROGRESS_PREPARING_RESPONSE = progress_event("Preparing response...")
+_PROGRESS_SUMMARIZING = progress_event("Summarizing conversation...")
+
 
 class ChatAgent(BaseAgent):
     """
@@ -47,25 +64,27 @@ class ChatAgent(BaseAgent):
         """
         Orchestrates the RAG, generation, and memory graphs for a streaming response.
         """
-        logger.info(f"ChatAgent: Starting stream_response for session {session.session_id}")
+        logger.info("ChatAgent: Starting stream_response for session {}", session.session_id)
 
         full_response_chunks = []
         try:
             # Step 1: Prepare the initial state
             session_state = SessionState.from_session(session)
             session_state.current_user_message_content = message
-            if context:
-                session_state.document_keys = [doc["key"] for doc in context["mention_documents"]]
+            mention_documents = context.get("mention_documents") if context else None
+            if mention_documents:
+                session_state.document_keys = [doc["key"] for doc in mention_documents]
             ## TODO: add mention_documents info to query generation
 
-            initial_state_dict = session_state.model_dump()
+            # Shallow view of the explicitly set fields; the graphs re-validate it, so no deep dump is needed
+            initial_state_dict = {name: getattr(session_state, name) for name in session_state.model_fields_set}
 
             # Step 2: Run the RAG graph to get context
             logger.info("ChatAgent: Running RAG workflow...")
-            if hasattr(context, "mention_documents") and context["mention_documents"]:
-                yield {"type": "progress", "data": {"message": "Reading documents..."}}
+            if mention_documents:
+                yield _PROGRESS_READING_DOCUMENTS
             else:
-                yield {"type": "progress", "data": {"message": "Reading knowledge bases..."}}
+                yield _PROGRESS_READING_KNOWLEDGE_BASES
             rag_result = await self.graphs.rag_app.ainvoke(initial_state_dict)
 
             # Merge the RAG results back into the state for the next graph
@@ -73,7 +92,7 @@ class ChatAgent(BaseAgent):
 
             # Step 3: Run the Generation graph with the (potentially updated) state
             logger.info("ChatAgent: Running Generation workflow...")
-            yield {"type": "progress", "data": {"message": "Preparing response..."}}
+            yield _PROGRESS_PREPARING_RESPONSE
             gen_result = await self.graphs.generation_app.ainvoke(current_state_dict)
 
             prepared_messages = gen_result.get("prepared_messages")
@@ -81,13 +100,39 @@ class ChatAgent(BaseAgent):
             # Step 4: Stream the final response from the LLM
             if prepared_messages:
                 logger.info("ChatAgent: Starting LLM streaming...")
-                yield {"type": "progress", "data": {"message": random.choice(self.COZY_MESSAGES)}}
+                yield self.random_cozy_progress()
                 
                 # Use base agent's cancellation hooks
                 cancellation_event, monitor_task = self.create_cancellation_monitor(request)
-                
+
+                loop = asyncio.get_running_loop()
+                pending_chunks = []
+                pending_chars = 0
+                last_flush = loop.time()
+                stream = aiter(self.graphs.llm.astream(prepared_messages, cancellation_event=cancellation_event))
+                next_chunk: asyncio.Future | None = None
                 try:
-                    async for chunk in self.graphs.llm.astream(prepared_messages, cancellation_event=cancellation_event):
+                    while True:
+                        if pending_chunks:
+                            # Buffered text goes out once the interval has passed, even while the model stalls
+                            if next_chunk is None:
+                                next_chunk = asyncio.ensure_future(anext(stream))
+                            remaining = last_flush + STREAM_FLUSH_INTERVAL - loop.time()
+                            if remaining <= 0 or not (await asyncio.wait((next_chunk,), timeout=remaining))[0]:
+                                yield "".join(pending_chunks)
+                                pending_chunks.clear()
+                                pending_chars = 0
+                                last_flush = loop.time()
+                                continue
+                        try:
+                            if next_chunk is not None:
+                                waiting, next_chunk = next_chunk, None
+                                chunk = await waiting
+                            else:
+                                chunk = await anext(stream)
+                        except StopAsyncIteration:
+                            break
+
                         if cancellation_event.is_set():
                             logger.info("LLM streaming cancelled.")
                             break
@@ -95,14 +140,33 @@ class ChatAgent(BaseAgent):
                         if chunk.message.content:
                             content = chunk.message.content
                             full_response_chunks.append(content)
-                            yield content
+                            pending_chunks.append(content)
+                            pending_chars += len(content)
+
+                            if pending_chars >= STREAM_FLUSH_CHARS:
+                                yield "".join(pending_chunks)
+                                pending_chunks.clear()
+                                pending_chars = 0
+                                last_flush = loop.time()
+
+                    if pending_chunks:
+                        yield "".join(pending_chunks)
+                        pending_chunks.clear()
                 except Exception as e:
                     if "CancellationError" in str(type(e)) or "cancelled" in str(e).lower():
                         logger.info("LLM streaming was cancelled.")
+                        if pending_chunks:
+                            yield "".join(pending_chunks)
                         yield "Request was cancelled."
                     else:
                         raise e
                 finally:
+                    if next_chunk is not None:
+                        # The stream can only be closed once the read in flight has stopped
+                        next_chunk.cancel()
+                        await asyncio.gather(next_chunk, return_exceptions=True)
+                    if aclose := getattr(stream, "aclose", None):
+                        await aclose()
                     # Clean up using base agent method
                     await self.cleanup_cancellation_monitor(cancellation_event, monitor_task)
             else:
@@ -115,34 +179,67 @@ class ChatAgent(BaseAgent):
             # Step 5: Run the Memory graph in the background
             full_response = "".join(full_response_chunks)
 
-            # Create the final state object to pass to the memory update task
-            final_session_state = SessionState.model_validate(gen_result)
-            final_session_state.current_ai_response_content = full_response
-            yield {"type": "progress", "data": {"message": "Summarizing conversation..."}}
+            # Hand the generation result straight to the memory graph; it validates its own input
+            gen_result["current_ai_response_content"] = full_response
+            yield _PROGRESS_SUMMARIZING
 
-            asyncio.create_task(self._run_memory_update(final_session_state, session))
+            self._schedule_memory_update(gen_result, session)
 
         except Exception as e:
-            logger.error(f"Error in ChatAgent streaming orchestration: {e}", exc_info=True)
+            logger.opt(exception=True).error("Error in ChatAgent streaming orchestration: {}", e)
             yield f"I encountered an error: {str(e)}"
 
-    async def _run_memory_update(self, final_state: SessionState, session: Session):
+    def _schedule_memory_update(self, final_state: dict[str, Any], session: Session):
+        """Schedules the background memory update, cancelling any older one still running for the session.
+
+        An older update that is due a summary/entity refresh is left to finish: the due check only
+        fires on specific turn counts, so the newer turn would not redo it.
+        """
+        session_id = session.session_id
+        previous, previous_due = _pending_memory_updates.pop(session_id, (None, False))
+        if previous and not previous.done():
+            if previous_due:
+                logger.info("ChatAgent: Letting due long-term memory update finish for session {}.", session_id)
+            else:
+                logger.info("ChatAgent: Cancelling superseded memory update for session {}.", session_id)
+                previous.cancel()
+
+        # Mirrors the memory graph, which recounts the messages before deciding
+        state = SessionState.model_construct(**final_state)
+        state.message_count = len(state.messages)
+        due = should_update_long_term_memory(state) == "update_summary"
+
+        task = asyncio.create_task(self._run_memory_update(final_state, session))
+        if task.done():
+            # Eager tasks may already have finished
+            return
+        _pending_memory_updates[session_id] = (task, due)
+
+        def _forget(finished: asyncio.Task):
+            pending = _pending_memory_updates.get(session_id)
+            if pending and pending[0] is finished:
+                del _pending_memory_updates[session_id]
+
+        task.add_done_callback(_forget)
+
+    async def _run_memory_update(self, final_state: dict[str, Any], session: Session):
         """Runs the memory graph in the background and updates the original session object."""
-        logger.info(f"ChatAgent: Running Memory Graph in background for session {session.session_id}...")
+        logger.info("ChatAgent: Running Memory Graph in background for session {}...", session.session_id)
         try:
             config = {"configurable": {"thread_id": session.session_id}}
 
-            # Invoke the memory graph to update history, LTM, and title
-            final_state_from_memory = await self.graphs.memory_app.ainvoke(final_state.model_dump(), config=config)
+            async with _memory_update_semaphore:
+                # Invoke the memory graph to update history, LTM, and title
+                final_state_from_memory = await self.graphs.memory_app.ainvoke(final_state, config=config)
 
             # Create a fully updated SessionState object and use it to update the live session
             if final_state_from_memory:
                 updated_session_state = SessionState.model_validate(final_state_from_memory)
                 updated_session_state.update_session(session)
 
-            logger.info(f"ChatAgent: Memory Graph finished for session {session.session_id}.")
+            logger.info("ChatAgent: Memory Graph finished for session {}.", session.session_id)
         except Exception as e:
-            logger.error(f"Error in background memory update: {e}", exc_info=True)
+            logger.opt(exception=True).error("Error in background memory update: {}", e)
 
     def get_agent_info(self) -> dict[str, Any]:
         """Get agent information."""
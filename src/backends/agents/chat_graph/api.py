@@ -4,8 +4,8 @@ FastAPI endpoints for the LangGraph Chat Agent.
 
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
 from ..agent_response import AgentResponse
@@ -22,11 +22,14 @@ router = APIRouter(prefix="/chat-graph", tags=["LangGraph Chat"])
 
 
 # Dependency to get session manager
-async def get_session_manager():
-    """Get the session manager instance."""
-    from ...sessions.manager import get_session_manager
+async def get_session_manager(http_request: Request):
+    """Get the session manager instance bound to app.state at startup."""
+    session_manager = getattr(http_request.app.state, "session_manager", None)
+    if session_manager is None:
+        from ...sessions.manager import get_session_manager
 
-    return await get_session_manager()
+        session_manager = await get_session_manager()
+    return session_manager
 
 
 @router.post("/message", response_model=AgentResponse)
@@ -38,7 +41,8 @@ async def process_chat_message(request: ChatRequest, session_manager=Depends(get
         response = await session_manager.process_message(
             message=request.message, session_id=request.session_id, context=request.context
         )
-        return response
+        # Serialize with Pydantic's Rust-backed encoder instead of jsonable_encoder + json.dumps
+        return Response(content=response.model_dump_json(), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to process message with LangGraph: {str(e)}")
 
@@ -49,14 +53,12 @@ async def stream_chat_message(request: ChatRequest, session_manager=Depends(get_
     Stream a response from the LangGraph chat agent.
     """
     try:
-
-        async def generate_chunks():
-            async for chunk in session_manager.stream_response(
+        return StreamingResponse(
+            session_manager.stream_response(
                 message=request.message, session_id=request.session_id, context=request.context
-            ):
-                yield chunk
-
-        return StreamingResponse(generate_chunks(), media_type="text/plain")
+            ),
+            media_type="text/plain",
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to stream message with LangGraph: {str(e)}")
 
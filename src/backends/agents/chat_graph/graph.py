@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any
 
 import loguru
@@ -6,11 +7,11 @@ from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from langgraph.graph import END, StateGraph
 
-from ...tools.utils import get_active_knowledge_bases
+from ...tools.utils import get_active_knowledge_bases_cached
 
 # Assuming these imports are correctly set up from your project structure
 from ...user_config import UserConfig
-from ..utils import convert_to_basemessages, truncate_think_tag
+from ..utils import BatchingLLMProxy, PromptCache, convert_to_basemessages, truncate_think_tag
 from .memory import (
     extract_and_update_entities,
     should_update_long_term_memory,
@@ -25,6 +26,23 @@ from .tools import search_documents
 
 logger = loguru.logger
 
+# Shared across sessions: identical query/title prompts for the same model reuse the earlier answer
+llm_response_cache = PromptCache()
+
+# Upper bound on concurrent requests per coalesced batch of auxiliary prompts
+LLM_BATCH_CONCURRENCY = 8
+
+
+# Characters kept from each end of a history message in the RAG query prompt
+HISTORY_EXCERPT_HALF = 200
+
+
+def _truncate_middle(text: str) -> str:
+    """Keeps the head and tail of long text; short text is returned as-is."""
+    if len(text) <= 2 * HISTORY_EXCERPT_HALF:
+        return text
+    return f"{text[:HISTORY_EXCERPT_HALF]} ... {text[-HISTORY_EXCERPT_HALF:]}"
+
 
 def should_run_rag(state: SessionState) -> str:
     """
@@ -32,7 +50,7 @@ def should_run_rag(state: SessionState) -> str:
     It checks the 'run_rag' flag in the state to decide the next step.
     """
     if state.run_rag:
-        return "generate_rag_query"
+        return "run_rag"
     else:
         return END
 
@@ -49,6 +67,8 @@ class AgentGraphs:
         self.user_config = user_config
         self.checkpointer = checkpointer
         self.llm = llm
+        # Short auxiliary prompts (query, summary, entities, title) are coalesced across sessions
+        self.batched_llm = BatchingLLMProxy(llm, max_concurrency=LLM_BATCH_CONCURRENCY)
         self.rag_app = None
         self.generation_app = None
         self.memory_app = None
@@ -61,10 +81,10 @@ class AgentGraphs:
     # --- RAG Workflow Nodes ---
     async def decide_rag_necessity(self, state: SessionState) -> dict[str, Any]:
         """Determines if RAG should be executed and sets the run_rag flag."""
-        has_keys = bool(getattr(state, "document_keys", None))
-        has_kbs = bool(await get_active_knowledge_bases())
+        # Mentioned documents are searched by key, so the knowledge base lookup is only needed without them
+        has_keys = bool(state.document_keys)
 
-        if has_keys or has_kbs:
+        if has_keys or await get_active_knowledge_bases_cached():
             logger.info("RAG required: Proceeding to generate query.")
             return {"run_rag": True}
 
@@ -73,31 +93,29 @@ class AgentGraphs:
 
     async def generate_rag_query(self, state: SessionState) -> dict[str, Any]:
         """Generates a search query from the user's message."""
-        history = ""
-        recent_messages = state.messages[-4:]
-
-        def truncate_middle(text, max_length=400):
-            half = max_length // 2
-            return text[:half] + " ... " + text[-half:]
-
-        for msg in recent_messages:
-            role = "User" if isinstance(msg, HumanMessage) else "Assistant"
-            history += f"{role}: {truncate_middle(msg.content)}....\n"
+        history = "".join(
+            f"{'User' if msg.type == 'human' else 'Assistant'}: {_truncate_middle(msg.content)}....\n"
+            for msg in state.messages[-4:]
+        )
 
         user_question = state.current_user_message_content
 
         # Use the academic search query prompt
         prompt = get_simple_query_prompt(user_question, history)
 
-        response = await self.llm.ainvoke(prompt)
-        query = truncate_think_tag(response.content.strip().replace('"', ""))
+        model = self.user_config.model_name
+        query = llm_response_cache.get(model, prompt)
+        if query is None:
+            response = await self.batched_llm.ainvoke(prompt)
+            query = truncate_think_tag(response.content.strip().replace('"', ""))
+            llm_response_cache.set(model, prompt, query)
         logger.info(f"Generated RAG Query: '{query}'")
         return {"rag_query": query}
 
     async def perform_rag_search(self, state: SessionState) -> dict[str, Any]:
         """Performs semantic search using the generated query."""
         query = state.rag_query
-        keys = getattr(state, "document_keys", None)
+        keys = state.document_keys
         if keys:
             logger.info(f"Performing RAG search on specific keys: {keys}")
             # Import RAGService to query specific documents by keys
@@ -109,19 +127,34 @@ class AgentGraphs:
             results = await search_documents(query, n_results=16)
         return {"rag_results": results}
 
+    async def run_rag(self, state: SessionState) -> dict[str, Any]:
+        """Runs query generation, search and formatting back to back as a single graph node."""
+        updates: dict[str, Any] = {}
+        for step in (self.generate_rag_query, self.perform_rag_search):
+            result = await step(state)
+            for key, value in result.items():
+                setattr(state, key, value)
+            updates.update(result)
+        updates.update(self.format_rag_context(state))
+        return updates
+
     def format_rag_context(self, state: SessionState) -> dict[str, Any]:
         """Formats the raw search results into a clean context string."""
-        results = getattr(state, "rag_results", [])
+        results = state.rag_results
         if not results:
             return {"rag_context": ""}
 
-        rag_context = "The following information from a knowledge base may be relevant to the user's question.\n\n--- RELEVANT INFORMATION ---\n"
-        for result in results:
-            content = result.get("content", "N/A")
-            title = result.get("metadata", {}).get("title", "Source")
-            rag_context += f"[{title}]: {content}\n\n"
-        rag_context += "--- END OF INFORMATION ---\nIf this information is relevant, use it to inform your answer. If it is not relevant, ignore it and answer the user's question from your general knowledge."
-        return {"rag_context": rag_context}
+        parts = [
+            "The following information from a knowledge base may be relevant to the user's question.\n\n--- RELEVANT INFORMATION ---\n"
+        ]
+        parts.extend(
+            f"[{result.get('metadata', {}).get('title', 'Source')}]: {result.get('content', 'N/A')}\n\n"
+            for result in results
+        )
+        parts.append(
+            "--- END OF INFORMATION ---\nIf this information is relevant, use it to inform your answer. If it is not relevant, ignore it and answer the user's question from your general knowledge."
+        )
+        return {"rag_context": "".join(parts)}
 
     # --- Generation Workflow Node ---
     def prepare_final_prompt(self, state: SessionState) -> dict[str, Any]:
@@ -151,16 +184,32 @@ class AgentGraphs:
         Keep state.messages unchanged; just keep counters in sync.
         """
         state.message_count = len(state.messages)
-        return {"messages": state.messages, "message_count": state.message_count}
+        # Messages are unchanged, so only the counter goes back into the graph state
+        return {"message_count": state.message_count}
 
     def check_memory_update_needed(self, state: SessionState) -> str:
         return should_update_long_term_memory(state)
 
+    async def run_memory_updates(self, state: SessionState) -> dict[str, Any]:
+        """Runs the summary, entity and title LLM calls concurrently and merges their updates."""
+        jobs = [self.generate_title(state)]
+        if self.check_memory_update_needed(state) == "update_summary":
+            jobs.append(self.update_conversation_summary(state))
+            jobs.append(self.extract_key_entities_and_preferences(state))
+
+        merged: dict[str, Any] = {}
+        for result in await asyncio.gather(*jobs, return_exceptions=True):
+            if isinstance(result, BaseException):
+                logger.error(f"Memory update step failed: {result}")
+                continue
+            merged.update(result)
+        return merged
+
     async def update_conversation_summary(self, state: SessionState) -> dict[str, Any]:
-        return await update_conversation_summary(state, self.llm)
+        return await update_conversation_summary(state, self.batched_llm)
 
     async def extract_key_entities_and_preferences(self, state: SessionState) -> dict[str, Any]:
-        return await extract_and_update_entities(state, self.llm)
+        return await extract_and_update_entities(state, self.batched_llm)
 
     async def generate_title(self, state: SessionState) -> dict[str, str]:
         """Generates a title for the conversation and adds it to the state."""
@@ -176,11 +225,17 @@ class AgentGraphs:
 
         prompt = f"Generate a short, descriptive title (3-5 words) for a conversation starting with:\n\nUser: {first_user_msg_content[:150]}\n\nRespond with only the title."
 
+        model = self.user_config.model_name
+        title = llm_response_cache.get(model, prompt)
+        if title is not None:
+            return {"title": title}
+
         try:
-            response = await self.llm.ainvoke(prompt)
-            title = truncate_think_tag(response.content.strip().strip("\"'"))
+            response = await self.batched_llm.ainvoke(prompt)
+            title = truncate_think_tag(response.content.strip().strip("\"'"))[:50]
+            llm_response_cache.set(model, prompt, title)
             logger.info(f"Generated title: '{title}'")
-            return {"title": title[:50]}
+            return {"title": title}
         except Exception as e:
             logger.error(f"Failed to generate title: {e}")
             return {}
@@ -192,20 +247,17 @@ class AgentGraphs:
         workflow = StateGraph(SessionState)
 
         workflow.add_node("decide_rag_necessity", self.decide_rag_necessity)
-        workflow.add_node("generate_rag_query", self.generate_rag_query)
-        workflow.add_node("perform_rag_search", self.perform_rag_search)
-        workflow.add_node("format_rag_context", self.format_rag_context)
+        # Query generation, search and formatting always run in sequence, so they share one node
+        workflow.add_node("run_rag", self.run_rag)
 
         workflow.set_entry_point("decide_rag_necessity")
         workflow.add_conditional_edges(
             "decide_rag_necessity",
             should_run_rag,
-            {"generate_rag_query": "generate_rag_query", END: END},
+            {"run_rag": "run_rag", END: END},
         )
 
-        workflow.add_edge("generate_rag_query", "perform_rag_search")
-        workflow.add_edge("perform_rag_search", "format_rag_context")
-        workflow.add_edge("format_rag_context", END)
+        workflow.add_edge("run_rag", END)
 
         self.rag_app = workflow.compile()
         logger.info("✅ RAG workflow compiled")
@@ -223,19 +275,12 @@ class AgentGraphs:
         """Builds the memory workflow for updating history, LTM, and title."""
         workflow = StateGraph(SessionState)
         workflow.add_node("save_exchange", self.save_conversation_exchange)
-        workflow.add_node("update_summary", self.update_conversation_summary)
-        workflow.add_node("extract_entities", self.extract_key_entities_and_preferences)
-        workflow.add_node("generate_title", self.generate_title)
+        # Summary, entities and title only read the saved exchange, so they share one concurrent node
+        workflow.add_node("run_memory_updates", self.run_memory_updates)
 
         workflow.set_entry_point("save_exchange")
-        workflow.add_conditional_edges(
-            "save_exchange",
-            self.check_memory_update_needed,
-            {"update_summary": "update_summary", "end_turn": "generate_title"},
-        )
-        workflow.add_edge("update_summary", "extract_entities")
-        workflow.add_edge("extract_entities", "generate_title")
-        workflow.add_edge("generate_title", END)
+        workflow.add_edge("save_exchange", "run_memory_updates")
+        workflow.add_edge("run_memory_updates", END)
 
         if self.checkpointer:
             self.memory_app = workflow.compile(checkpointer=self.checkpointer)
@@ -5,6 +5,7 @@ This module contains utility functions for managing conversation memory,
 including summarization, entity extraction, and memory updates.
 """
 
+import re
 from typing import Any
 
 from langchain_core.language_models.chat_models import BaseChatModel
@@ -43,8 +44,10 @@ def update_conversation_history(state: SessionState) -> dict[str, Any]:
         state.new_messages_to_save = []
     state.new_messages_to_save.extend([user_message, ai_message])
 
-    if len(state.messages) > state.max_history_length * 2:
-        state.messages = state.messages[-state.max_history_length * 2 :]
+    # Trim in place rather than rebinding to a sliced copy
+    excess = len(state.messages) - state.max_history_length * 2
+    if excess > 0:
+        del state.messages[:excess]
 
     return {
         "messages": state.messages,
@@ -63,7 +66,8 @@ def should_update_long_term_memory(state: SessionState) -> str:
         str: "update_summary" if memory should be updated, "end_turn" otherwise
     """
     logger.debug("--- Conditional Edge: Should Update Long-Term Memory? ---")
-    if state.message_count > 0 and (state.message_count // 2) % state.memory_update_frequency == 0:
+    message_count = state.message_count
+    if message_count > 0 and (message_count // 2) % state.memory_update_frequency == 0:
         logger.debug("Decision: YES, update long-term memory.")
         return "update_summary"
     logger.debug("Decision: NO, skip long-term memory update.")
@@ -121,13 +125,12 @@ async def extract_and_update_entities(state: SessionState, llm: BaseChatModel) -
         analysis_response = await llm.ainvoke([HumanMessage(content=prompt)])
         updates = parse_memory_analysis(analysis_response.content)
 
-        new_topics = state.key_topics.copy()
-        for topic in updates.get("topics", []):
-            if topic not in new_topics:
-                new_topics.append(topic)
+        # Set membership keeps the merge linear; set.add returns None so new topics pass the filter once
+        seen = set(state.key_topics)
+        added = [t for t in updates.get("topics", []) if not (t in seen or seen.add(t))]
+        new_topics = state.key_topics + added
 
-        new_preferences = state.user_preferences.copy()
-        new_preferences.update(updates.get("preferences", {}))
+        new_preferences = {**state.user_preferences, **updates.get("preferences", {})}
 
         return {
             "key_topics": new_topics[-10:],
@@ -180,6 +183,33 @@ def format_messages_for_llm_prompt(messages: list[BaseMessage]) -> str:
     return "\n\n".join(parts)
 
 
+def _parse_topics(value: str, updates: dict[str, Any]) -> None:
+    if value.lower() not in ("none", "[list of topics]", ""):
+        updates["topics"] = [t.strip() for t in value.split(",") if t.strip()]
+
+
+def _parse_preferences(value: str, updates: dict[str, Any]) -> None:
+    if value.lower() not in ("none", "[key: value pairs]", ""):
+        for pref in _COMMA_RE.split(value):
+            key, sep, pref_value = pref.partition(":")
+            if sep:
+                updates["preferences"][key.strip()] = pref_value.strip()
+
+
+def _parse_important(value: str, updates: dict[str, Any]) -> None:
+    if value.lower() not in ("none", "[key information to remember]", ""):
+        updates["important"] = [value]
+
+
+_MEMORY_LINE_RE = re.compile(r"^\s*(topics|preferences|important)\s*:(.*)$", re.IGNORECASE | re.MULTILINE)
+_COMMA_RE = re.compile(r",\s*")
+_MEMORY_SECTION_PARSERS = {
+    "topics": _parse_topics,
+    "preferences": _parse_preferences,
+    "important": _parse_important,
+}
+
+
 def parse_memory_analysis(analysis_text: str) -> dict[str, Any]:
     """
     Parse memory analysis text into structured data.
@@ -191,22 +221,6 @@ def parse_memory_analysis(analysis_text: str) -> dict[str, Any]:
         Dict containing parsed topics, preferences, and important information
     """
     updates = {"topics": [], "preferences": {}, "important": []}
-    lines = analysis_text.split("\n")
-    for line in lines:
-        line_l = line.lower().strip()
-        if line_l.startswith("topics:"):
-            topics_text = line.split(":", 1)[1].strip()
-            if topics_text.lower() not in ["none", "[list of topics]", ""]:
-                updates["topics"] = [t.strip() for t in topics_text.split(",") if t.strip()]
-        elif line_l.startswith("preferences:"):
-            prefs_text = line.split(":", 1)[1].strip()
-            if prefs_text.lower() not in ["none", "[key: value pairs]", ""]:
-                for pref in prefs_text.split(","):
-                    if ":" in pref:
-                        key, value = pref.split(":", 1)
-                        updates["preferences"][key.strip()] = value.strip()
-        elif line_l.startswith("important:"):
-            important_text = line.split(":", 1)[1].strip()
-            if important_text.lower() not in ["none", "[key information to remember]", ""]:
-                updates["important"] = [important_text]
+    for match in _MEMORY_LINE_RE.finditer(analysis_text):
+        _MEMORY_SECTION_PARSERS[match.group(1).lower()](match.group(2).strip(), updates)
     return updates
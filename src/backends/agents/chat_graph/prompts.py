@@ -5,6 +5,7 @@ This module contains prompt templates for various LangGraph workflow operations.
 """
 
 import json
+from functools import lru_cache
 from typing import Any
 
 
@@ -26,6 +27,12 @@ def get_memory_update_prompt(user_message: str, assistant_response: str) -> str:
     )
 
 
+@lru_cache(maxsize=128)
+def _dump_preferences(items: tuple[tuple[str, Any], ...]) -> str:
+    """Serialize preference items once; identical preferences recur on every turn of a session."""
+    return json.dumps(dict(items))
+
+
 def get_context_aware_prompt(conversation_summary: str, key_topics: list[str], user_preferences: dict[str, Any]) -> str:
     """Generate a context-aware prompt that includes conversation memory."""
     context_parts = []
@@ -34,7 +41,12 @@ def get_context_aware_prompt(conversation_summary: str, key_topics: list[str], u
     if key_topics:
         context_parts.append(f"Key Topics: {', '.join(key_topics)}")
     if user_preferences:
-        context_parts.append(f"User Preferences: {json.dumps(user_preferences)}")
+        try:
+            preferences_json = _dump_preferences(tuple(user_preferences.items()))
+        except TypeError:
+            # Unhashable values can't be cached
+            preferences_json = json.dumps(user_preferences)
+        context_parts.append(f"User Preferences: {preferences_json}")
 
     if not context_parts:
         return ""
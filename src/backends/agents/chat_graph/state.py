@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from datetime import datetime
+from functools import cached_property
 from typing import Any
 
 from langchain_core.messages import BaseMessage
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field
 
 from ...sessions.session import Session
 from ...user_config.models import UserConfig, create_chat_config
@@ -35,12 +36,12 @@ class SessionState(BaseModel):
     rag_context: str = ""  # Pre-formatted context for RAG
     document_keys: list[str] = Field(default_factory=list)  # Document keys for RAG
 
-    # Configuration for this session's memory (derived from user_config)
-    @property
+    # Configuration for this session's memory (derived from user_config, read once per state)
+    @cached_property
     def max_history_length(self) -> int:
         return self.user_config.max_history_length
 
-    @property
+    @cached_property
     def memory_update_frequency(self) -> int:
         return self.user_config.memory_update_frequency
 
@@ -58,31 +59,24 @@ class SessionState(BaseModel):
     class Config:
         arbitrary_types_allowed = True
 
-    @field_validator("messages", mode="before")
-    @classmethod
-    def serialize_messages(cls, v: Any) -> list[dict[str, Any]]:
-        if not v:
-            return []
-        if isinstance(v[0], BaseMessage):
-            # If messages are already BaseMessage objects, serialize them to dicts
-            return [msg.model_dump() for msg in v]
-        # Otherwise, assume they are already dicts and return as is
-        return v
-
     @classmethod
     def from_session(cls, session: Session) -> SessionState:
-        """Create a SessionState object from a Session object."""
-        return cls(
+        """Create a SessionState object from a Session object.
+
+        The Session fields are already typed, so validation is skipped. Containers are
+        copied so graph nodes never mutate the live session.
+        """
+        return cls.model_construct(
             session_id=session.session_id,
             user_config=session.user_config,
-            messages=session.messages,
+            messages=list(session.messages),
             title=session.title,
             created_at=session.created_at,
             last_activity=session.last_activity,
             message_count=session.message_count,
             conversation_summary=session.conversation_summary,
-            key_topics=session.key_topics,
-            user_preferences=session.user_preferences,
+            key_topics=list(session.key_topics),
+            user_preferences=dict(session.user_preferences),
         )
 
     def update_session(self, session: Session) -> None:
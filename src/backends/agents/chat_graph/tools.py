@@ -1,5 +1,11 @@
+from functools import cache
+
 from langchain_core.tools import tool
 
 from ...tools.chroma.read_tools import get_document_by_id, query_documents_with_context, search_documents
 
-tools_list = [tool(search_documents), tool(query_documents_with_context), tool(get_document_by_id)]
+
+@cache
+def get_tools_list():
+    """Wrap the read tools on first use; `tool()` introspects each signature, so it runs once."""
+    return [tool(search_documents), tool(query_documents_with_context), tool(get_document_by_id)]
@@ -1,5 +1,8 @@
 import asyncio
-from collections.abc import AsyncGenerator
+import functools
+import os
+import time
+from collections.abc import AsyncGenerator, Callable
 from typing import TYPE_CHECKING, Any
 
 from langchain_core.messages import HumanMessage
@@ -8,21 +11,49 @@ from loguru import logger
 
 from ...sessions.session import Session
 from ...user_config import UserConfig
-from ..base import BaseAgent
+from ..base import BaseAgent, progress_event
+from ..utils import PromptCache
+from .cache import SemanticCache, context_hash
 from .graph import enhanced_deep_research_graph
+from .utils import get_today_str
 
 if TYPE_CHECKING:
     from ...llm.chatlitellm import LLM
 
-import os
-langfuse_handler = None
+# Research runs in flight, keyed by context hash and normalized question; resolve to the final report
+_inflight_research: dict[str, asyncio.Future] = {}
+
+# Node updates drive progress events; "custom" carries the final report tokens
+_STREAM_MODES = ["updates", "custom"]
+
+# Tags attached to every research run; LangChain copies tags when merging configs, so one list is shared
+_RUN_TAGS = ["langsmith:nostream"]
+
+# Static progress events, yielded as-is
+_PROGRESS_CLARIFICATION_COMPLETE = progress_event("Clarification stage complete")
+_STAGE_PROGRESS = {
+    node: progress_event(message)
+    for node, message in (
+        ("write_research_brief", "Research brief prepared"),
+        ("research_supervisor", "Research supervision and delegation running"),
+        ("final_report_generation", "Final report generation in progress"),
+    )
+}
 
-if os.environ.get("LANGFUSE_SECRET_KEY"):
+
+@functools.lru_cache(maxsize=1)
+def _get_langfuse_handler():
+    """Builds the Langfuse callback handler on first use; None when tracing is not configured."""
+    if not os.environ.get("LANGFUSE_SECRET_KEY"):
+        return None
     try:
         from langfuse.langchain import CallbackHandler
-        langfuse_handler = CallbackHandler()
-    except:
+
+        return CallbackHandler()
+    except Exception:
         logger.warning("Langfuse is not installed, skipping langfuse handler")
+        return None
+
 
 class DeepResearchAgent(BaseAgent):
     """
@@ -34,18 +65,30 @@ class DeepResearchAgent(BaseAgent):
     Features enhanced duplicate prevention and sophisticated multi-stage research workflow.
     """
 
-    def __init__(self, user_config: UserConfig, llm: "LLM"):
+    __slots__ = ("user_config", "llm", "graph", "_cache", "_exact_cache")
+
+    def __init__(self, user_config: UserConfig, llm: "LLM", embedder: Callable[[list[str]], list[list[float]]] | None = None):
         self.user_config = user_config
         self.llm = llm
         self.graph = enhanced_deep_research_graph
+        # Near-duplicate questions in the same conversation reuse the earlier report
+        self._cache = SemanticCache(embedder=embedder, threshold=0.92, ttl=3600) if embedder else None
+        # Verbatim re-runs at temperature 0 are answered from here before any embedding call
+        self._exact_cache = PromptCache(maxsize=64)
         logger.debug("✅ DeepResearchAgent initialized for your 3 tools")
 
     @classmethod
     async def create(cls, user_config: UserConfig, checkpointer=None) -> "DeepResearchAgent":
         from ...llm import create_chatlitellm_from_user_config
+        from ...rag.embedding import get_embedding_function
 
         llm = await create_chatlitellm_from_user_config(user_config)
-        return cls(user_config, llm)
+        try:
+            embedder = await get_embedding_function()
+        except Exception as e:
+            logger.warning("Semantic research cache disabled, no embedding function: {}", e)
+            embedder = None
+        return cls(user_config, llm, embedder)
 
     async def stream_response(
         self,
@@ -54,75 +97,150 @@ class DeepResearchAgent(BaseAgent):
         context: dict[str, Any] | None = None,
         request: Any | None = None,
     ) -> AsyncGenerator[dict[str, Any], None]:
+        # Blank input has nothing to research, so the graph is never started for it
+        if not message or not message.strip():
+            yield {"type": "content", "data": "Please provide a research question."}
+            return
+
         try:
             yield {"type": "progress", "data": {"message": "🔬 Initializing focused deep research..."}}
 
-            runnable_config: RunnableConfig = {
-                "configurable": {
-                    "llm_instance": self.llm,
-                },
-                "metadata": {
-                    "owner": self.user_config.user_id or "anonymous",
-                },
-                "tags": ["langsmith:nostream"],
-                "callbacks": [langfuse_handler] if langfuse_handler else None,
-            }
-
-            # Include conversation history for better context
-            all_messages = []
-            if session and hasattr(session, 'messages') and session.messages:
-                all_messages.extend(session.messages)
-            all_messages.append(HumanMessage(content=message))
-            
-            graph_input = {"messages": all_messages}
-
-            yield {"type": "progress", "data": {"message": "🚀 Running focused deep research workflow..."}}
-
-            start_time = asyncio.get_event_loop().time()
-            final_state = None
-            async for event in self.graph.astream(graph_input, runnable_config):
-                final_state = event
-                if isinstance(event, dict):
-                    # Stream the AI message from the clarification node if it exists
-                    if "clarify_with_user" in event:
-                        try:
-                            node_out = event.get("clarify_with_user", {})
-                            messages = node_out.get("messages") or []
-                            for msg in messages:
-                                if content := getattr(msg, "content", None):
-                                    yield {"type": "content", "data": str(content)}
-                        except Exception:
-                            pass
-                        yield {"type": "progress", "data": {"message": "Clarification stage complete"}}
-                    
-                    # Yield progress updates for other major stages
-                    if "write_research_brief" in event:
-                        yield {"type": "progress", "data": {"message": "Research brief prepared"}}
-                    if "research_supervisor" in event:
-                        yield {"type": "progress", "data": {"message": "Research supervision and delegation running"}}
-                    if "final_report_generation" in event:
-                        yield {"type": "progress", "data": {"message": "Final report generation in progress"}}
-
-            # After the stream, check the final state to determine the outcome
-            if final_state and list(final_state.keys()) == ["clarify_with_user"]:
-                # The graph ended at the clarification step, so we are done for now.
-                return
-
-            execution_time = asyncio.get_event_loop().time() - start_time
-            yield {"type": "progress", "data": {"message": f"✅ Research completed in {execution_time:.1f}s"}}
-
-            final_report = None
-            if isinstance(final_state, dict):
-                # Safely access the final report from the potentially nested final state
-                report_node_output = final_state.get("final_report_generation", final_state)
-                final_report = report_node_output.get("final_report")
-
+            history = session.messages if session else []
+            owner = self.user_config.user_id or "anonymous"
+            ctx_hash = context_hash(self.user_config.model_name, owner, history)
+
+            deterministic = self.user_config.temperature == 0
+            if deterministic:
+                cached_report = self._exact_cache.get(ctx_hash, message)
+                if cached_report is not None:
+                    yield {"type": "content", "data": cached_report}
+                    return
+
+            key_vec = None
+            if self._cache:
+                key_vec = await self._cache.embed(message)
+                if key_vec is not None:
+                    hit = await self._cache.lookup(key_vec, ctx_hash)
+                    if hit:
+                        yield {"type": "content", "data": hit["final_report"]}
+                        return
+
+            # Identical requests already running are joined rather than started again
+            flight_key = f"{ctx_hash}:{' '.join(message.split())}"
+            inflight = _inflight_research.get(flight_key)
+            if inflight is not None:
+                yield {"type": "progress", "data": {"message": "🔗 Joining an identical research run in progress..."}}
+                shared_report = await asyncio.shield(inflight)
+                if shared_report:
+                    yield {"type": "content", "data": shared_report}
+                    return
+
+            report_future = asyncio.get_running_loop().create_future()
+            _inflight_research[flight_key] = report_future
+            try:
+                async for event in self._run_workflow(message, history, owner, report_future):
+                    yield event
+            finally:
+                if _inflight_research.get(flight_key) is report_future:
+                    del _inflight_research[flight_key]
+                if not report_future.done():
+                    report_future.set_result(None)
+
+            # Error and partial reports resolve to None, so a failure is never replayed from either cache
+            final_report = report_future.result()
             if final_report:
-                yield {"type": "content", "data": "\n"}
-                yield {"type": "content", "data": final_report}
+                if deterministic:
+                    self._exact_cache.set(ctx_hash, message, final_report)
+                if key_vec is not None:
+                    await self._cache.store(key_vec, ctx_hash, {"final_report": final_report})
 
         except Exception as e:
-            logger.error(f"Error in DeepResearchAgent: {e}", exc_info=True)
+            logger.opt(exception=True).error("Error in DeepResearchAgent: {}", e)
             yield {"type": "content", "data": f"An error occurred during research: {e}"}
 
-
+    async def _run_workflow(
+        self,
+        message: str,
+        history: list,
+        owner: str,
+        report_future: asyncio.Future,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """Runs the research graph, streaming its events and resolving `report_future` with the final report."""
+        langfuse_handler = _get_langfuse_handler()
+        runnable_config: RunnableConfig = {
+            "configurable": {
+                "llm_instance": self.llm,
+                # One date for the whole run keeps every prompt stable, including across midnight
+                "run_date": get_today_str(),
+            },
+            "metadata": {
+                "owner": owner,
+            },
+            "tags": _RUN_TAGS,
+            "callbacks": [langfuse_handler] if langfuse_handler else None,
+        }
+
+        # Include conversation history for better context, built in a single allocation
+        all_messages = [*history, HumanMessage(content=message)]
+
+        graph_input = {"messages": all_messages}
+
+        yield {"type": "progress", "data": {"message": "🚀 Running focused deep research workflow..."}}
+
+        start_time = time.perf_counter()
+        # Only the outcome is kept from each event, so large intermediate states are released as the run goes
+        final_report = None
+        final_report_partial = False
+        final_report_error = False
+        ended_at_clarification = False
+        report_streamed = False
+        async for mode, event in self.graph.astream(graph_input, runnable_config, stream_mode=_STREAM_MODES):
+            if mode == "custom":
+                # Final report tokens, forwarded as they are generated
+                if type(event) is dict and (report_chunk := event.get("final_report_chunk")):
+                    if not report_streamed:
+                        report_streamed = True
+                        yield {"type": "content", "data": "\n"}
+                    yield {"type": "content", "data": report_chunk}
+                continue
+
+            ended_at_clarification = False
+            # Update events are plain dicts keyed by node name
+            if type(event) is dict:
+                ended_at_clarification = len(event) == 1 and "clarify_with_user" in event
+                report_node_output = event.get("final_report_generation", event)
+                if isinstance(report_node_output, dict):
+                    final_report = report_node_output.get("final_report") or final_report
+                    final_report_partial = report_node_output.get("final_report_partial", final_report_partial)
+                    final_report_error = report_node_output.get("final_report_error", final_report_error)
+
+                # Stream the AI message from the clarification node if it exists
+                if "clarify_with_user" in event:
+                    # Resolved before yielding, so errors thrown into this generator are never swallowed here
+                    try:
+                        messages = event["clarify_with_user"].get("messages") or ()
+                    except AttributeError:
+                        messages = ()
+                    for msg in messages:
+                        if content := getattr(msg, "content", None):
+                            yield {"type": "content", "data": content if type(content) is str else str(content)}
+                    yield _PROGRESS_CLARIFICATION_COMPLETE
+
+                # Yield progress updates for other major stages; events are keyed by node name
+                for node in event:
+                    if progress := _STAGE_PROGRESS.get(node):
+                        yield progress
+
+        # After the stream, check the last event to determine the outcome
+        if ended_at_clarification:
+            # The graph ended at the clarification step, so we are done for now.
+            return
+
+        execution_time = time.perf_counter() - start_time
+        yield {"type": "progress", "data": {"message": f"✅ Research completed in {execution_time:.1f}s"}}
+
+        # Joined requests get the report as soon as it exists; a partial or failed one is neither shared nor cached
+        report_future.set_result(None if final_report_partial or final_report_error else final_report)
+        if final_report and not report_streamed:
+            yield {"type": "content", "data": "\n"}
+            yield {"type": "content", "data": final_report}
@@ -0,0 +1,103 @@
+"""Semantic response cache for the Deep Research agent."""
+
+import asyncio
+import hashlib
+import json
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from langchain_core.messages import BaseMessage
+from loguru import logger
+
+# Number of trailing conversation messages that scope a cache entry
+CONTEXT_WINDOW_MESSAGES = 4
+
+
+def context_hash(model: str, owner: str, messages: list[BaseMessage]) -> str:
+    """
+    Hash the model name, the requesting user and the recent message chain.
+
+    Follow-ups such as "make it shorter" only match answers given after the same
+    conversation, instead of aliasing to an unrelated cached report.
+    """
+    recent = [getattr(msg, "content", str(msg)) for msg in messages[-CONTEXT_WINDOW_MESSAGES:]]
+    payload = json.dumps([model, owner, recent], ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _normalize(vector: list[float]) -> list[float]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else vector
+
+
+class SemanticCache:
+    """
+    In-memory LRU of research results, matched by embedding similarity.
+
+    An entry is returned when its context hash matches exactly and the cosine
+    similarity of the question embeddings is at least `threshold`. Entries expire
+    after `ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        embedder: Callable[[list[str]], list[list[float]]],
+        threshold: float = 0.92,
+        ttl: float = 3600,
+        maxsize: int = 128,
+    ):
+        self.embedder = embedder
+        self.threshold = threshold
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # Entries grouped by context hash; each holds (expires_at, unit vector, value)
+        self._entries: OrderedDict[str, list[tuple[float, list[float], dict[str, Any]]]] = OrderedDict()
+        self._size = 0
+
+    async def embed(self, text: str) -> list[float] | None:
+        """Embed `text` off the event loop; returns None if the embedding provider fails."""
+        normalized = " ".join(text.split())
+        try:
+            vectors = await asyncio.to_thread(self.embedder, [normalized])
+            return _normalize(vectors[0])
+        except Exception as e:
+            logger.debug(f"Semantic cache disabled for this request, embedding failed: {e}")
+            return None
+
+    async def lookup(self, key_vec: list[float], ctx_hash: str) -> dict[str, Any] | None:
+        """Return the closest cached value for this context, or None below the threshold."""
+        bucket = self._entries.get(ctx_hash)
+        if not bucket:
+            return None
+
+        now = time.monotonic()
+        live = [entry for entry in bucket if entry[0] > now]
+        self._size -= len(bucket) - len(live)
+        if not live:
+            del self._entries[ctx_hash]
+            return None
+        bucket[:] = live
+
+        best_score, best_value = -1.0, None
+        for _, vector, value in live:
+            score = sum(a * b for a, b in zip(key_vec, vector))
+            if score > best_score:
+                best_score, best_value = score, value
+
+        if best_score < self.threshold:
+            return None
+        self._entries.move_to_end(ctx_hash)
+        logger.info(f"Semantic cache hit (similarity {best_score:.3f})")
+        return best_value
+
+    async def store(self, key_vec: list[float], ctx_hash: str, value: dict[str, Any]) -> None:
+        """Cache `value` for this question embedding and context, evicting the least recently used contexts."""
+        self._entries.setdefault(ctx_hash, []).append((time.monotonic() + self.ttl, key_vec, value))
+        self._entries.move_to_end(ctx_hash)
+        self._size += 1
+        while self._size > self.maxsize and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
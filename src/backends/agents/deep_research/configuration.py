@@ -1,12 +1,16 @@
 """Configuration management for the Deep Research system."""
 
-from typing import Any, Optional
+from typing import Any, ClassVar, Optional
 from langchain_core.runnables import RunnableConfig
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class Configuration(BaseModel):
     """Configuration for the Deep Research agent."""
+
+    # Frozen so the shared default instance can be handed to every node
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    _default: ClassVar[Optional["Configuration"]] = None
     
     # Core research parameters
     allow_clarification: bool = Field(default=True)
@@ -14,6 +18,11 @@ class Configuration(BaseModel):
     max_researcher_iterations: int = Field(default=10)
     max_react_tool_calls: int = Field(default=15)
     max_structured_output_retries: int = Field(default=3)
+    # Reuse answers for byte-identical clarify, brief and compression prompts
+    cache_llm_responses: bool = Field(default=True)
+    # Most recent tool-calling turns (AI message plus its tool results) sent back to the model; 0 keeps all
+    supervisor_history_window: int = Field(default=6)
+    researcher_history_window: int = Field(default=6)
     
     # Token limits for different model tasks
     clarification_max_tokens: int = Field(default=2048)
@@ -27,5 +36,7 @@ class Configuration(BaseModel):
         cls, config: Optional[RunnableConfig] = None
     ) -> "Configuration":
         """Create a Configuration instance from a RunnableConfig."""
-        # Use defaults since you have your own LLM factory
-        return cls()
+        # Use defaults since you have your own LLM factory; they are validated once and reused
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
@@ -3,23 +3,26 @@ Modified from https://github.com/langchain-ai/open_deep_research/blob/main/src/o
 """
 
 import asyncio
-import json
-from typing import Literal
-from collections import defaultdict
+import functools
+from typing import Any, Literal
+from collections import OrderedDict
 
+from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import (
     AIMessage,
     HumanMessage,
     SystemMessage,
     ToolMessage,
-    filter_messages,
     get_buffer_string,
 )
 from langchain_core.runnables import RunnableConfig
-from langchain_core.tools import tool, render_text_description
+from langchain_core.tools import tool
+from langgraph.config import get_stream_writer
 from langgraph.graph import END, START, StateGraph
 from langgraph.types import Command
 from loguru import logger
+import orjson
+from pydantic import ValidationError
 
 from .configuration import Configuration
 from .prompts import (
@@ -29,6 +32,7 @@ from .prompts import (
     final_report_generation_prompt,
     lead_researcher_prompt,
     research_system_prompt,
+    summarize_findings_chunk_prompt,
     transform_messages_into_research_topic_prompt,
 )
 from .state import (
@@ -43,13 +47,28 @@ from .state import (
     SupervisorState,
 )
 from .utils import (
-    get_all_tools,
+    aexecute_tool_calls,
+    get_tool_bundle,
     get_today_str,
     get_model_token_limit,
-    is_token_limit_exceeded,
+    get_notes_from_tool_calls,
+    is_context_window_error,
+    remove_up_to_last_ai_message,
 )
 from .tool_wrapper import create_model_with_tools
 from .utils import think_tool
+from ..utils import PromptCache
+
+# Shared across runs: identical clarify/brief/compress prompts for the same model reuse the earlier answer
+llm_response_cache = PromptCache()
+
+# Task-configured runnables keyed by (id(llm), schema, max_tokens, retries). Each cached runnable holds
+# a reference to its LLM, so an id cannot be reused while its entry is alive.
+MAX_CACHED_TASK_LLMS = 64
+_task_llm_cache: OrderedDict[tuple, Any] = OrderedDict()
+# Tool-bound models for the supervisor and researcher loops, keyed by (id(llm), tool names, retries, max_tokens)
+_tool_model_cache: OrderedDict[tuple, Any] = OrderedDict()
+
 
 # Helper function to get LLM for specific tasks
 def get_llm_for_task(config: RunnableConfig, schema=None, max_tokens=None, retries=3):
@@ -57,7 +76,25 @@ def get_llm_for_task(config: RunnableConfig, schema=None, max_tokens=None, retri
     llm = config.get("configurable", {}).get("llm_instance")
     if not llm:
         raise ValueError("No LLM instance provided in config")
-    
+
+    key = (id(llm), schema, max_tokens, retries)
+    try:
+        cached = _task_llm_cache.get(key)
+    except TypeError:
+        # Unhashable schema, build without caching
+        return _build_llm_for_task(llm, schema, max_tokens, retries)
+    if cached is not None:
+        _task_llm_cache.move_to_end(key)
+        return cached
+
+    task_llm = _build_llm_for_task(llm, schema, max_tokens, retries)
+    _task_llm_cache[key] = task_llm
+    if len(_task_llm_cache) > MAX_CACHED_TASK_LLMS:
+        _task_llm_cache.popitem(last=False)
+    return task_llm
+
+
+def _build_llm_for_task(llm, schema, max_tokens, retries):
     # Configure for this specific task
     if schema:
         llm = llm.with_structured_output(schema)
@@ -69,28 +106,106 @@ def get_llm_for_task(config: RunnableConfig, schema=None, max_tokens=None, retri
     return llm
 
 
-def get_notes_from_tool_calls(messages):
-    """Extract notes from tool call results."""
-    notes = []
+def get_model_with_tools(llm, tools, retries: int, max_tokens: int | None):
+    """Bind `tools` to `llm` once and reuse the result on every later turn with the same settings."""
+    key = (id(llm), tuple(sorted(t.name for t in tools)), retries, max_tokens)
+    cached = _tool_model_cache.get(key)
+    if cached is not None:
+        _tool_model_cache.move_to_end(key)
+        return cached
+
+    # Use wrapper chooser to avoid native function-calling on unsupported models
+    model = create_model_with_tools(
+        llm=llm,
+        tools=list(tools),
+        config_dict={},
+        retries=retries,
+        max_tokens=max_tokens,
+    )
+    _tool_model_cache[key] = model
+    if len(_tool_model_cache) > MAX_CACHED_TASK_LLMS:
+        _tool_model_cache.popitem(last=False)
+    return model
+
+
+# Prefixes get_buffer_string gives the message types that appear in research state
+_BUFFER_PREFIXES = {"human": "Human", "ai": "AI", "system": "System", "tool": "Tool"}
+
+
+def _buffer_string(messages) -> str:
+    """
+    Same text as `get_buffer_string`, formatting plain-text messages directly.
+
+    Messages with tool calls or non-string content still go through LangChain.
+    """
+    lines = []
     for msg in messages:
-        if hasattr(msg, 'type') and msg.type == 'tool':
-            notes.append(str(msg.content))
-    return notes
+        prefix = _BUFFER_PREFIXES.get(getattr(msg, "type", None))
+        content = getattr(msg, "content", None)
+        if (
+            prefix
+            and type(content) is str
+            and not getattr(msg, "tool_calls", None)
+            and "function_call" not in getattr(msg, "additional_kwargs", {})
+        ):
+            lines.append(f"{prefix}: {content}")
+        else:
+            lines.append(get_buffer_string([msg]))
+    return "\n".join(lines)
+
+
+def get_run_date(config: RunnableConfig) -> str:
+    """Date fixed for the whole research run, so prompts stay identical across its nodes and retries."""
+    return config.get("configurable", {}).get("run_date") or get_today_str()
+
+
+async def ainvoke_cached(model, messages, config: RunnableConfig, task: str, schema=None):
+    """
+    Invoke `model`, answering byte-identical prompts from `llm_response_cache`.
+
+    Structured answers are stored as JSON and revalidated against `schema` on a hit;
+    an entry that no longer validates is replaced by a fresh LLM call.
+    """
+    configurable = Configuration.from_runnable_config(config)
+    if not configurable.cache_llm_responses:
+        return await model.ainvoke(messages)
+
+    llm = config.get("configurable", {}).get("llm_instance")
+    scope = f"{getattr(llm, 'model_name', '')}:{task}"
+    prompt = _buffer_string(messages)
+    cached = llm_response_cache.get(scope, prompt)
+    if cached is not None:
+        if schema is None:
+            return AIMessage(content=cached)
+        try:
+            return schema.model_validate_json(cached)
+        except ValidationError:
+            pass
+
+    response = await model.ainvoke(messages)
+    if schema is None:
+        if isinstance(response.content, str) and response.content:
+            llm_response_cache.set(scope, prompt, response.content)
+    elif isinstance(response, schema):
+        llm_response_cache.set(scope, prompt, response.model_dump_json())
+    return response
+
 
+def trim_message_history(messages, window: int):
+    """
+    Keep the leading prompt messages and the last `window` AI turns with their tool results.
 
-def remove_up_to_last_ai_message(messages):
-    """Remove messages up to the last AI message to handle token limits."""
-    if not messages:
+    Cuts only land on an AI message, so no tool result is separated from the call it answers.
+    """
+    if window <= 0:
         return messages
-    
-    # Find last AI message
-    last_ai_index = -1
-    for i, msg in enumerate(messages):
-        if hasattr(msg, 'type') and msg.type == 'ai':
-            last_ai_index = i
-    
-    if last_ai_index >= 0:
-        return messages[last_ai_index:]
+    head_end = next((i for i, msg in enumerate(messages) if getattr(msg, 'type', None) == 'ai'), len(messages))
+    turns = 0
+    for i in range(len(messages) - 1, head_end, -1):
+        if getattr(messages[i], 'type', None) == 'ai':
+            turns += 1
+            if turns == window:
+                return messages[:head_end] + messages[i:]
     return messages
 
 
@@ -111,10 +226,12 @@ async def clarify_with_user(state: AgentState, config: RunnableConfig) -> Comman
     )
     
     prompt_content = clarify_with_user_instructions.format(
-        messages=get_buffer_string(messages), 
-        date=get_today_str()
+        messages=_buffer_string(messages), 
+        date=get_run_date(config)
+    )
+    response = await ainvoke_cached(
+        clarification_model, [HumanMessage(content=prompt_content)], config, "clarify", schema=ClarifyWithUser
     )
-    response = await clarification_model.ainvoke([HumanMessage(content=prompt_content)])
     
     # Handle response
     try:
@@ -148,6 +265,26 @@ async def clarify_with_user(state: AgentState, config: RunnableConfig) -> Comman
         )
 
 
+@functools.lru_cache(maxsize=16)
+def _supervisor_system_prompt(date: str, max_concurrent_research_units: int, max_researcher_iterations: int) -> str:
+    """Supervisor prompt, formatted once per date and research limits."""
+    return lead_researcher_prompt.format(
+        date=date,
+        max_concurrent_research_units=max_concurrent_research_units,
+        max_researcher_iterations=max_researcher_iterations
+    )
+
+
+@functools.lru_cache(maxsize=16)
+def _researcher_system_prompt(tools_description: str, date: str) -> str:
+    """Researcher prompt, formatted once per date instead of on every ReAct turn."""
+    return research_system_prompt.format(
+        tools_description=tools_description,
+        mcp_prompt="",  # No MCP
+        date=date
+    )
+
+
 async def write_research_brief(state: AgentState, config: RunnableConfig) -> Command[Literal["research_supervisor"]]:
     """Transform user messages into a structured research brief and initialize supervisor."""
     configurable = Configuration.from_runnable_config(config)
@@ -158,11 +295,15 @@ async def write_research_brief(state: AgentState, config: RunnableConfig) -> Com
         retries=configurable.max_structured_output_retries
     )
     
+    # Also the fallback brief, so the history is formatted once
+    messages_buffer = _buffer_string(state.get("messages", []))
     prompt_content = transform_messages_into_research_topic_prompt.format(
-        messages=get_buffer_string(state.get("messages", [])),
-        date=get_today_str()
+        messages=messages_buffer,
+        date=get_run_date(config)
+    )
+    response = await ainvoke_cached(
+        research_model, [HumanMessage(content=prompt_content)], config, "research_brief", schema=ResearchQuestion
     )
-    response = await research_model.ainvoke([HumanMessage(content=prompt_content)])
     
     # Handle response
     try:
@@ -172,16 +313,16 @@ async def write_research_brief(state: AgentState, config: RunnableConfig) -> Com
             if isinstance(response, dict):
                 response = ResearchQuestion.model_validate(response)
             else:
-                fallback_brief = get_buffer_string(state.get("messages", [])) or "Research the user's request."
+                fallback_brief = messages_buffer or "Research the user's request."
                 response = ResearchQuestion(research_brief=fallback_brief)
     except Exception:
-        fallback_brief = get_buffer_string(state.get("messages", [])) or "Research the user's request."
+        fallback_brief = messages_buffer or "Research the user's request."
         response = ResearchQuestion(research_brief=fallback_brief)
     
-    supervisor_system_prompt = lead_researcher_prompt.format(
-        date=get_today_str(),
-        max_concurrent_research_units=configurable.max_concurrent_research_units,
-        max_researcher_iterations=configurable.max_researcher_iterations
+    supervisor_system_prompt = _supervisor_system_prompt(
+        get_run_date(config),
+        configurable.max_concurrent_research_units,
+        configurable.max_researcher_iterations
     )
     
     return Command(
@@ -199,26 +340,31 @@ async def write_research_brief(state: AgentState, config: RunnableConfig) -> Com
     )
 
 
+@functools.cache
+def get_lead_researcher_tools() -> tuple:
+    """Supervisor tools, converted once and shared by every supervisor turn."""
+    # Do not expose think_tool to the LLM; we'll inject reflections deterministically in the graph
+    return (tool(ConductResearch), tool(ResearchComplete), think_tool)
+
+
 async def supervisor(state: SupervisorState, config: RunnableConfig) -> Command[Literal["supervisor_tools"]]:
     """Lead research supervisor that plans research strategy and delegates to researchers."""
     configurable = Configuration.from_runnable_config(config)
-    # Do not expose think_tool to the LLM; we'll inject reflections deterministically in the graph
-    lead_researcher_tools = [tool(ConductResearch), tool(ResearchComplete), think_tool]
+    lead_researcher_tools = get_lead_researcher_tools()
     
     llm = config.get("configurable", {}).get("llm_instance")
     if not llm:
         raise ValueError("No LLM instance provided in config")
     
-    # Use wrapper chooser to avoid native function-calling on unsupported models
-    research_model = create_model_with_tools(
-        llm=llm,
-        tools=lead_researcher_tools,
-        config_dict={},
+    research_model = get_model_with_tools(
+        llm,
+        lead_researcher_tools,
         retries=configurable.max_structured_output_retries,
         max_tokens=configurable.tool_wrapper_max_tokens,
     )
     
-    supervisor_messages = state.get("supervisor_messages", [])
+    # Older delegation rounds are dropped from the prompt; their results stay in state for the final notes
+    supervisor_messages = trim_message_history(state.get("supervisor_messages", []), configurable.supervisor_history_window)
     response = await research_model.ainvoke(supervisor_messages)
     
     return Command(
@@ -230,6 +376,33 @@ async def supervisor(state: SupervisorState, config: RunnableConfig) -> Command[
     )
 
 
+# Pause before the single retry of a researcher that failed with a rate limit, server error or dropped connection
+RESEARCH_RETRY_DELAY = 2.0
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """Whether `error` is a rate limit, provider-side failure or network blip worth one retry."""
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
+async def _run_researcher(research_topic: str, config: RunnableConfig) -> dict:
+    """Run one researcher subgraph on `research_topic`, retrying once after a backoff on transient errors."""
+    for attempt in range(2):
+        try:
+            return await researcher_subgraph.ainvoke({
+                "researcher_messages": [HumanMessage(content=research_topic)],
+                "research_topic": research_topic
+            }, config)
+        except Exception as e:
+            if attempt or not _is_transient_error(e):
+                raise
+            logger.warning(f"Researcher hit a transient error, retrying in {RESEARCH_RETRY_DELAY}s: {e}")
+            await asyncio.sleep(RESEARCH_RETRY_DELAY)
+
+
 async def supervisor_tools(state: SupervisorState, config: RunnableConfig) -> Command[Literal["supervisor", "__end__"]]:
     """Execute tools called by the supervisor, including research delegation and strategic thinking.
     
@@ -294,60 +467,57 @@ async def supervisor_tools(state: SupervisorState, config: RunnableConfig) -> Co
     ]
     
     if conduct_research_calls:
-        try:
-            # Limit concurrent research units to prevent resource exhaustion
-            allowed_conduct_research_calls = conduct_research_calls[:configurable.max_concurrent_research_units]
-            overflow_conduct_research_calls = conduct_research_calls[configurable.max_concurrent_research_units:]
-            
-            # Execute research tasks in parallel
-            research_tasks = [
-                researcher_subgraph.ainvoke({
-                    "researcher_messages": [
-                        HumanMessage(content=tool_call["args"]["research_topic"])
-                    ],
-                    "research_topic": tool_call["args"]["research_topic"]
-                }, config) 
-                for tool_call in allowed_conduct_research_calls
-            ]
-            
-            tool_results = await asyncio.gather(*research_tasks)
-            
-            # Create tool messages with research results
-            for observation, tool_call in zip(tool_results, allowed_conduct_research_calls):
-                all_tool_messages.append(ToolMessage(
-                    content=observation.get("compressed_research", "Error synthesizing research report: Maximum retries exceeded"),
-                    name=tool_call["name"],
-                    tool_call_id=tool_call["id"]
-                ))
-            
-            # Handle overflow research calls with error messages
-            for overflow_call in overflow_conduct_research_calls:
-                all_tool_messages.append(ToolMessage(
-                    content=f"Error: Did not run this research as you have already exceeded the maximum number of concurrent research units. Please try again with {configurable.max_concurrent_research_units} or fewer research units.",
-                    name="ConductResearch",
-                    tool_call_id=overflow_call["id"]
-                ))
-            
-            # Aggregate raw notes from all research results
-            raw_notes_concat = "\n".join([
-                "\n".join(observation.get("raw_notes", [])) 
-                for observation in tool_results
-            ])
-            
-            if raw_notes_concat:
-                update_payload["raw_notes"] = [raw_notes_concat]
-                
-        except Exception as e:
-            # Handle research execution errors
-            if is_token_limit_exceeded(e, configurable.research_model) or True:
-                # Token limit exceeded or other error - end research phase
-                return Command(
-                    goto=END,
-                    update={
-                        "notes": get_notes_from_tool_calls(supervisor_messages),
-                        "research_brief": state.get("research_brief", "")
-                    }
-                )
+        # Limit concurrent research units to prevent resource exhaustion
+        allowed_conduct_research_calls = conduct_research_calls[:configurable.max_concurrent_research_units]
+        overflow_conduct_research_calls = conduct_research_calls[configurable.max_concurrent_research_units:]
+        
+        # Execute research tasks in parallel; a failed researcher does not cancel its siblings
+        tool_results = await asyncio.gather(
+            *(_run_researcher(tool_call["args"]["research_topic"], config) for tool_call in allowed_conduct_research_calls),
+            return_exceptions=True,
+        )
+        
+        # Create tool messages with research results
+        completed_results = []
+        for observation, tool_call in zip(tool_results, allowed_conduct_research_calls):
+            if isinstance(observation, BaseException):
+                if not isinstance(observation, Exception):
+                    raise observation
+                if is_context_window_error(observation):
+                    # Token limit exceeded - end research phase with the notes gathered so far
+                    return Command(
+                        goto=END,
+                        update={
+                            "notes": get_notes_from_tool_calls(supervisor_messages),
+                            "research_brief": state.get("research_brief", "")
+                        }
+                    )
+                logger.warning(f"Research on a delegated topic failed: {observation}")
+                content = f"Error: Research on this topic failed: {observation}"
+            else:
+                completed_results.append(observation)
+                content = observation.get("compressed_research", "Error synthesizing research report: Maximum retries exceeded")
+            all_tool_messages.append(ToolMessage(
+                content=content,
+                name=tool_call["name"],
+                tool_call_id=tool_call["id"]
+            ))
+        
+        # Handle overflow research calls with error messages
+        for overflow_call in overflow_conduct_research_calls:
+            all_tool_messages.append(ToolMessage(
+                content=f"Error: Did not run this research as you have already exceeded the maximum number of concurrent research units. Please try again with {configurable.max_concurrent_research_units} or fewer research units.",
+                name="ConductResearch",
+                tool_call_id=overflow_call["id"]
+            ))
+        
+        # Aggregate raw notes from all research results
+        raw_notes_concat = "\n".join(
+            note for observation in completed_results for note in observation.get("raw_notes", ())
+        )
+        
+        if raw_notes_concat:
+            update_payload["raw_notes"] = [raw_notes_concat]
     
     # Step 3: Return command with all tool results
     update_payload["supervisor_messages"] = all_tool_messages
@@ -364,31 +534,27 @@ async def researcher(state: ResearcherState, config: RunnableConfig) -> Command[
     configurable = Configuration.from_runnable_config(config)
     researcher_messages = state.get("researcher_messages", [])
     
-    tools = await get_all_tools(config)
+    tools, tools_description, _ = get_tool_bundle()
     if len(tools) == 0:
         raise ValueError("No tools found to conduct research")
     
-    tools_description = render_text_description(tools)
-    researcher_prompt = research_system_prompt.format(
-        tools_description=tools_description,
-        mcp_prompt="",  # No MCP
-        date=get_today_str()
-    )
+    researcher_prompt = _researcher_system_prompt(tools_description, get_run_date(config))
     
     llm = config.get("configurable", {}).get("llm_instance")
     if not llm:
         raise ValueError("No LLM instance provided in config")
     
-    # Use wrapper chooser to avoid native function-calling on unsupported models
-    research_model = create_model_with_tools(
-        llm=llm,
-        tools=tools,
-        config_dict={},
+    research_model = get_model_with_tools(
+        llm,
+        tools,
         retries=configurable.max_structured_output_retries,
         max_tokens=configurable.tool_wrapper_max_tokens,
     )
     
-    messages = [SystemMessage(content=researcher_prompt)] + researcher_messages
+    # Compression still sees the full history; only the tool-calling prompt is bounded
+    messages = trim_message_history(
+        [SystemMessage(content=researcher_prompt)] + researcher_messages, configurable.researcher_history_window
+    )
     response = await research_model.ainvoke(messages)
     
     return Command(
@@ -400,6 +566,45 @@ async def researcher(state: ResearcherState, config: RunnableConfig) -> Command[
     )
 
 
+_NORMALIZED_SEARCH_TOOLS = ("web_meta_search_tool", "search_documents")
+
+
+def _dumps_sorted(args: dict) -> bytes:
+    # Keys are serialized for every tool call on every researcher turn, so orjson rather than json
+    return orjson.dumps(args, option=orjson.OPT_SORT_KEYS)
+
+
+def _tool_call_keys(tool_name: str, args: dict) -> tuple[tuple, tuple | None]:
+    """Exact de-duplication key for a tool call, plus a case/space-normalized key for search tools."""
+    exact_key = (tool_name, _dumps_sorted(args))
+    if tool_name not in _NORMALIZED_SEARCH_TOOLS:
+        return exact_key, None
+    normalized_args = {k.lower().strip(): v.lower().strip() if isinstance(v, str) else v for k, v in args.items()}
+    return exact_key, (tool_name.lower(), _dumps_sorted(normalized_args))
+
+
+def _collect_prior_tool_calls(messages) -> tuple[set, dict[str, int]]:
+    """Rebuild the executed-call keys and per-tool counts from message history."""
+    # Only calls answered by a ToolMessage count as executed
+    executed_tool_call_ids = {
+        getattr(msg, "tool_call_id", "") 
+        for msg in messages 
+        if getattr(msg, "type", "") == "tool"
+    }
+    prior_calls = set()
+    tool_call_counts = {}
+    for prior_msg in messages:
+        if getattr(prior_msg, "type", "") == "ai" and getattr(prior_msg, "tool_calls", None):
+            for prior_call in prior_msg.tool_calls:
+                if prior_call.get("id") in executed_tool_call_ids:
+                    tool_name = prior_call.get("name", "unknown")
+                    tool_call_counts[tool_name] = tool_call_counts.get(tool_name, 0) + 1
+                    for key in _tool_call_keys(tool_name, prior_call.get("args", {})):
+                        if key is not None:
+                            prior_calls.add(key)
+    return prior_calls, tool_call_counts
+
+
 async def researcher_tools(state: ResearcherState, config: RunnableConfig) -> Command[Literal["researcher", "compress_research"]]:
     """Execute tools called by the researcher with robust duplicate prevention based on successful execution."""
     configurable = Configuration.from_runnable_config(config)
@@ -410,61 +615,32 @@ async def researcher_tools(state: ResearcherState, config: RunnableConfig) -> Co
     if not most_recent_message.tool_calls:
         return Command(goto="compress_research")
     
-    tools = await get_all_tools(config)
-    tools_by_name = {
-        tool.name if hasattr(tool, "name") else tool.get("name", "web_search"): tool 
-        for tool in tools
-    }
+    tools_by_name = get_tool_bundle()[2]
     
-    # Step 1: Identify the IDs of all tool calls that were successfully executed (i.e., have a ToolMessage)
-    executed_tool_call_ids = {
-        getattr(msg, "tool_call_id", "") 
-        for msg in researcher_messages[:-1] 
-        if getattr(msg, "type", "") == "tool"
-    }
-
-    # Step 2: Build a history of prior SUCCESSFUL calls by looking at AIMessages that have a corresponding ToolMessage
-    prior_calls = set()
-    tool_call_counts = defaultdict(int)
-    
-    for prior_msg in researcher_messages[:-1]:
-        if getattr(prior_msg, "type", "") == "ai" and getattr(prior_msg, "tool_calls", None):
-            for prior_call in prior_msg.tool_calls:
-                # Only consider it a "prior call" if it was actually executed
-                if prior_call.get("id") in executed_tool_call_ids:
-                    tool_name = prior_call.get("name", "unknown")
-                    args = prior_call.get("args", {})
-                    
-                    tool_call_counts[tool_name] += 1
-                    
-                    # Add exact key for de-duplication
-                    exact_key = (tool_name, json.dumps(args, sort_keys=True))
-                    prior_calls.add(exact_key)
-
-                    # Add normalized key for search tools
-                    if tool_name in ["web_meta_search_tool", "search_documents"]:
-                        normalized_args = {}
-                        for k, v in args.items():
-                            if isinstance(v, str):
-                                normalized_args[k.lower().strip()] = v.lower().strip()
-                            else:
-                                normalized_args[k.lower().strip()] = v
-                        normalized_key = (tool_name.lower(), json.dumps(normalized_args, sort_keys=True))
-                        prior_calls.add(normalized_key)
+    # Step 1-2: History of prior executed calls, carried in state between iterations and only
+    # rebuilt from the messages when a researcher starts without it
+    if "prior_tool_calls" in state:
+        prior_calls = set(state["prior_tool_calls"])
+        tool_call_counts = dict(state.get("tool_call_counts") or {})
+    elif len(researcher_messages) <= 2:
+        # First step: only the research topic precedes this message, so nothing has run yet
+        prior_calls, tool_call_counts = set(), {}
+    else:
+        prior_calls, tool_call_counts = _collect_prior_tool_calls(researcher_messages[:-1])
 
     # Step 3: Filter the current batch of proposed tool calls against the history of successful ones
     tool_calls = most_recent_message.tool_calls
     seen_current = set()
     exec_calls = []
     duplicate_outputs = []
-    current_tool_counts = defaultdict(int)
+    current_tool_counts = {}
     
     for tc in tool_calls:
         tool_name = tc.get("name", "unknown")
         args = tc.get("args") or {}
         
         # Create exact key for the current call
-        exact_key = (tool_name, json.dumps(args, sort_keys=True))
+        exact_key, normalized_key = _tool_call_keys(tool_name, args)
         
         # Check for exact duplicates
         if exact_key in prior_calls or exact_key in seen_current:
@@ -477,12 +653,9 @@ async def researcher_tools(state: ResearcherState, config: RunnableConfig) -> Co
             continue
             
         # For search tools, check normalized duplicates
-        if tool_name in ["web_meta_search_tool", "search_documents"]:
-            normalized_args = {k.lower().strip(): v.lower().strip() if isinstance(v, str) else v for k, v in args.items()}
-            normalized_key = (tool_name.lower(), json.dumps(normalized_args, sort_keys=True))
-            
+        if normalized_key is not None:
             if normalized_key in prior_calls or normalized_key in seen_current:
-                logger.debug(f"Skipping similar search: {tool_name} with normalized args {normalized_args}")
+                logger.debug(f"Skipping similar search: {tool_name} with normalized args {normalized_key[1]}")
                 duplicate_outputs.append(ToolMessage(
                     content=f"🚫 Similar search skipped: A very similar query was already successfully executed.",
                     name=tool_name,
@@ -492,7 +665,7 @@ async def researcher_tools(state: ResearcherState, config: RunnableConfig) -> Co
             seen_current.add(normalized_key)
         
         # Apply rate limiting
-        total_calls_for_tool = tool_call_counts[tool_name] + current_tool_counts[tool_name]
+        total_calls_for_tool = tool_call_counts.get(tool_name, 0) + current_tool_counts.get(tool_name, 0)
         if total_calls_for_tool >= 4:
             logger.debug(f"Rate limiting {tool_name}: {total_calls_for_tool} calls already made")
             duplicate_outputs.append(ToolMessage(
@@ -504,35 +677,36 @@ async def researcher_tools(state: ResearcherState, config: RunnableConfig) -> Co
         
         # Approved for execution
         seen_current.add(exact_key)
-        current_tool_counts[tool_name] += 1
+        current_tool_counts[tool_name] = current_tool_counts.get(tool_name, 0) + 1
         exec_calls.append(tc)
 
-    # Step 4: Execute the approved, non-duplicate tool calls
-    async def execute_tool_safely(tool, args, config):
-        try:
-            return await tool.ainvoke(args, config)
-        except Exception as e:
-            return f"Error executing tool: {str(e)}"
-
-    tool_execution_tasks = [execute_tool_safely(tools_by_name[tc["name"]], tc["args"], config) for tc in exec_calls]
-    observations = await asyncio.gather(*tool_execution_tasks) if tool_execution_tasks else []
-    
-    tool_outputs = [
-        ToolMessage(
-            content=str(observation),
-            name=tool_call["name"],
-            tool_call_id=tool_call.get("id")
-        ) for observation, tool_call in zip(observations, exec_calls)
-    ] + duplicate_outputs
+    # Step 4: Execute the approved, non-duplicate tool calls concurrently
+    tool_outputs = await aexecute_tool_calls(exec_calls, tools_by_name, config) + duplicate_outputs
+
+    # Every call in this batch now has a ToolMessage, so all of them join the executed history
+    for tc in tool_calls:
+        tool_name = tc.get("name", "unknown")
+        tool_call_counts[tool_name] = tool_call_counts.get(tool_name, 0) + 1
+        prior_calls.update(key for key in _tool_call_keys(tool_name, tc.get("args") or {}) if key is not None)
+    update = {
+        "researcher_messages": tool_outputs,
+        "prior_tool_calls": prior_calls,
+        "tool_call_counts": tool_call_counts,
+    }
         
     # Check exit conditions
     exceeded_iterations = state.get("tool_call_iterations", 0) >= configurable.max_react_tool_calls
     research_complete_called = any(tool_call["name"] == "ResearchComplete" for tool_call in most_recent_message.tool_calls)
     
     if exceeded_iterations or research_complete_called:
-        return Command(goto="compress_research", update={"researcher_messages": tool_outputs})
+        return Command(goto="compress_research", update=update)
     
-    return Command(goto="researcher", update={"researcher_messages": tool_outputs})
+    return Command(goto="researcher", update=update)
+
+
+def _raw_notes(messages) -> str:
+    """Tool results and AI turns of a research history, joined in one pass."""
+    return "\n".join(str(msg.content) for msg in messages if getattr(msg, "type", None) in ("tool", "ai"))
 
 
 async def compress_research(state: ResearcherState, config: RunnableConfig):
@@ -543,20 +717,16 @@ async def compress_research(state: ResearcherState, config: RunnableConfig):
     researcher_messages = state.get("researcher_messages", [])
     researcher_messages.append(HumanMessage(content=compress_research_simple_human_message))
     
+    # Built once; only a token-limit retry trims the history and rebuilds the prompt
+    compression_system = SystemMessage(content=compress_research_system_prompt.format(date=get_run_date(config)))
+    messages = [compression_system, *researcher_messages]
+    raw_notes_content = _raw_notes(researcher_messages)
     synthesis_attempts = 0
     max_attempts = 3
     
     while synthesis_attempts < max_attempts:
         try:
-            compression_prompt = compress_research_system_prompt.format(date=get_today_str())
-            messages = [SystemMessage(content=compression_prompt)] + researcher_messages
-            
-            response = await synthesizer_model.ainvoke(messages)
-            
-            raw_notes_content = "\n".join([
-                str(message.content) 
-                for message in filter_messages(researcher_messages, include_types=["tool", "ai"])
-            ])
+            response = await ainvoke_cached(synthesizer_model, messages, config, "compress_research")
             
             return {
                 "compressed_research": str(response.content),
@@ -566,18 +736,15 @@ async def compress_research(state: ResearcherState, config: RunnableConfig):
         except Exception as e:
             synthesis_attempts += 1
             
-            if is_token_limit_exceeded(str(e), "user_model"):
+            if is_context_window_error(e):
                 researcher_messages = remove_up_to_last_ai_message(researcher_messages)
+                messages = [compression_system, *researcher_messages]
+                raw_notes_content = _raw_notes(researcher_messages)
                 continue
             
             continue
     
     # Fallback
-    raw_notes_content = "\n".join([
-        str(message.content) 
-        for message in filter_messages(researcher_messages, include_types=["tool", "ai"])
-    ])
-    
     return {
         "compressed_research": "Error synthesizing research report: Maximum retries exceeded",
         "raw_notes": [raw_notes_content]
@@ -586,30 +753,97 @@ async def compress_research(state: ResearcherState, config: RunnableConfig):
 
 # ==================== FINAL REPORT GENERATION ====================
 
+def _chunk_notes(notes: list[str], chunk_chars: int) -> list[str]:
+    """Pack notes into chunks of at most `chunk_chars` characters, splitting notes that are longer on their own."""
+    chunks, current, current_len = [], [], 0
+    for note in notes:
+        for start in range(0, max(len(note), 1), chunk_chars):
+            piece = note[start:start + chunk_chars]
+            if current and current_len + len(piece) + 1 > chunk_chars:
+                chunks.append("\n".join(current))
+                current, current_len = [], 0
+            current.append(piece)
+            current_len += len(piece) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+async def _map_reduce_notes(notes: list[str], research_brief: str, config: RunnableConfig) -> str:
+    """
+    Condense findings that do not fit the model context.
+
+    Notes are packed into chunks of about half the context, each chunk is summarized
+    in parallel, and the summaries are joined back into a single findings string.
+    """
+    configurable = Configuration.from_runnable_config(config)
+    llm = config.get("configurable", {}).get("llm_instance")
+    # Rough estimate used across the graph: 1 token ≈ 4 characters
+    chunk_chars = get_model_token_limit(getattr(llm, "model_name", "user_model")) * 2
+    chunks = _chunk_notes(notes, chunk_chars)
+    summarizer = get_llm_for_task(config, max_tokens=configurable.compression_max_tokens)
+
+    summaries = await asyncio.gather(
+        *(
+            summarizer.ainvoke([HumanMessage(content=summarize_findings_chunk_prompt.format(
+                research_brief=research_brief,
+                chunk=chunk
+            ))])
+            for chunk in chunks
+        ),
+        return_exceptions=True,
+    )
+    condensed = []
+    for chunk, summary in zip(chunks, summaries):
+        if isinstance(summary, Exception):
+            # Keep the part of the raw chunk that the truncation fallback would have kept
+            logger.warning(f"Summarizing a findings chunk failed: {summary}")
+            condensed.append(chunk[:int(len(chunk) * 0.7)])
+        else:
+            condensed.append(str(summary.content))
+    return "\n".join(condensed)
+
+
 async def final_report_generation(state: AgentState, config: RunnableConfig):
     """Generate the final comprehensive research report with retry logic."""
     notes = state.get("notes", [])
     cleared_state = {"notes": {"type": "override", "value": []}}
-    findings = "\n".join(notes)
-    
-    configurable = Configuration.from_runnable_config(config)
+    # Built once; token-limit retries slice shorter prefixes of it instead of rebuilding the string
+    full_findings = "\n".join(notes)
+    findings_end = len(full_findings)
+    research_brief = state.get("research_brief", "")
+    messages_buffer = _buffer_string(state.get("messages", []))
+    findings_condensed = False
     
     max_retries = 3
     current_retry = 0
+    # Report tokens are pushed to the "custom" stream as they arrive, so the client sees the report being written
+    configurable = Configuration.from_runnable_config(config)
+    llm = config.get("configurable", {}).get("llm_instance")
+    writer = get_stream_writer()
     
     while current_retry <= max_retries:
+        report_parts = []
         try:
             final_report_prompt = final_report_generation_prompt.format(
-                research_brief=state.get("research_brief", ""),
-                messages=get_buffer_string(state.get("messages", [])),
-                findings=findings,
-                date=get_today_str()
+                research_brief=research_brief,
+                messages=messages_buffer,
+                findings=full_findings[:findings_end],
+                date=get_run_date(config)
             )
             
-            report_model = get_llm_for_task(config, max_tokens=configurable.final_report_max_tokens)
-            final_report = await report_model.ainvoke([
-                HumanMessage(content=final_report_prompt)
-            ])
+            # The base-class stream keeps the run's callbacks (tracing) and the report token cap;
+            # LLM.astream is the cancellation-aware override, which bypasses both
+            async for chunk in BaseChatModel.astream(
+                llm,
+                [HumanMessage(content=final_report_prompt)],
+                config,
+                max_tokens=configurable.final_report_max_tokens,
+            ):
+                if content := chunk.content:
+                    report_parts.append(content)
+                    writer({"final_report_chunk": content})
+            final_report = AIMessage(content="".join(report_parts))
             
             return {
                 "final_report": final_report.content, 
@@ -618,9 +852,30 @@ async def final_report_generation(state: AgentState, config: RunnableConfig):
             }
             
         except Exception as e:
-            if is_token_limit_exceeded(str(e), "user_model"):
-                # Truncate findings by 30% and retry
-                findings = findings[:int(len(findings) * 0.7)]
+            if report_parts:
+                # Part of the report already reached the client, so keep it rather than restarting,
+                # but mark it as partial so it is never served from a cache
+                logger.warning(f"Final report stream interrupted: {e}")
+                notice = f"\n\n[Report interrupted: {e}]"
+                writer({"final_report_chunk": notice})
+                report_parts.append(notice)
+                final_report = AIMessage(content="".join(report_parts))
+                return {
+                    "final_report": final_report.content,
+                    "final_report_partial": True,
+                    "messages": [final_report],
+                    **cleared_state
+                }
+
+            if is_context_window_error(e):
+                if not findings_condensed and notes:
+                    # First overflow: summarize the notes chunk by chunk instead of dropping the tail
+                    findings_condensed = True
+                    full_findings = await _map_reduce_notes(notes, research_brief, config)
+                    findings_end = len(full_findings)
+                else:
+                    # Truncate findings by 30% and retry
+                    findings_end = int(findings_end * 0.7)
                 current_retry += 1
                 continue
             
@@ -629,6 +884,7 @@ async def final_report_generation(state: AgentState, config: RunnableConfig):
             if current_retry > max_retries:
                 return {
                     "final_report": f"Error generating final report: {str(e)}", 
+                    "final_report_error": True,
                     "messages": [AIMessage(content=f"Error generating final report: {str(e)}")],
                     **cleared_state
                 }
@@ -636,6 +892,7 @@ async def final_report_generation(state: AgentState, config: RunnableConfig):
     # Max retries exceeded
     return {
         "final_report": "Error generating final report: Maximum retries exceeded", 
+        "final_report_error": True,
         "messages": [AIMessage(content="Error generating final report: Maximum retries exceeded")],
         **cleared_state
     }
@@ -255,6 +255,18 @@ compress_research_simple_human_message = """All above messages are about researc
 
 DO NOT summarize the information. I want the raw information returned, just in a cleaner format. Make sure all relevant information is preserved - you can rewrite findings verbatim."""
 
+summarize_findings_chunk_prompt = """You are condensing one part of the research findings gathered for the research brief below, because all of the findings together are too long to write the final report from.
+<Research Brief>
+{research_brief}
+</Research Brief>
+
+Rewrite the findings below as a dense summary. Keep every fact, figure, name and date that is relevant to the brief, and keep the source URLs that support them. Drop repetition, boilerplate and anything unrelated to the brief.
+
+<Findings>
+{chunk}
+</Findings>
+"""
+
 final_report_generation_prompt = """Based on all the research conducted, create a comprehensive, well-structured answer to the overall research brief:
 <Research Brief>
 {research_brief}
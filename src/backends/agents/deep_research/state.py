@@ -70,6 +70,8 @@ class AgentState(MessagesState):
     raw_notes: Annotated[list[str], override_reducer] = []
     notes: Annotated[list[str], override_reducer] = []
     final_report: str
+    final_report_partial: bool = False
+    final_report_error: bool = False
 
 class SupervisorState(TypedDict):
     """State for the supervisor that manages research tasks."""
@@ -88,6 +90,9 @@ class ResearcherState(TypedDict):
     research_topic: str
     compressed_research: str
     raw_notes: Annotated[list[str], override_reducer] = []
+    # De-duplication history maintained by researcher_tools, so it isn't rebuilt from messages each turn
+    prior_tool_calls: set[tuple]
+    tool_call_counts: dict[str, int]
 
 class ResearcherOutputState(BaseModel):
     """Output state from individual researchers."""
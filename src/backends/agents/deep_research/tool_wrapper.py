@@ -2,23 +2,26 @@
 Tool Wrapper Library for LLM Models without Native Tool Support
 
 This library enables tool calling for models that don't natively support it
-(like gemma3:27b) using Instructor + LiteLLM for structured output extraction.
+(like gemma3:27b) using LiteLLM JSON mode for structured output extraction.
 
 It provides a drop-in replacement for .bind_tools() that works with any model.
 """
 
 import json
 import asyncio
-from typing import Any, Dict, List, Optional, Union, Callable
-from pydantic import BaseModel, Field
-from langchain_core.messages import AIMessage, ToolMessage
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union, Callable
+import orjson
+from pydantic import BaseModel, Field, ValidationError
+from langchain_core.messages import AIMessage, BaseMessage
 from langchain_core.tools import BaseTool, render_text_description
-import instructor
-import litellm
 from loguru import logger
-from ...llm.chatlitellm import LLM
+from ..utils import PromptCache
 from .configuration import Configuration
 
+if TYPE_CHECKING:
+    from ...llm.chatlitellm import LLM
+
 
 class ToolCall(BaseModel):
     """Structured representation of a tool call."""
@@ -34,9 +37,75 @@ class ToolChoice(BaseModel):
     reasoning: str = Field(description="Reasoning for tool usage decision")
 
 
+# Tool-selection instructions sent ahead of the conversation on every turn. Kept byte-identical so
+# providers can reuse the cached prompt prefix across the turns of a research loop.
+TOOL_SELECTION_INSTRUCTIONS = """You are a research assistant. Based on the conversation, analyze if any RESEARCH TOOLS should be used to gather more information.
+
+Your focus should be on calling research tools to gather information:
+- **search_documents**: Search internal knowledge base 
+- **web_meta_search_tool**: Search the web for current information
+- **get_document_by_id**: Retrieve specific documents
+
+Guidelines for research tool usage:
+1. Use research tools when you need to search for information or access external systems
+2. Don't use tools if you can answer directly from conversation context
+3. If multiple research tools are needed, you can call them in parallel
+4. Always provide reasoning for your tool choice decisions
+5. Focus on RESEARCH TOOLS ONLY - thinking will be handled separately
+
+Think step by step:
+1. What information is the human asking for?
+2. Do I have enough information from the conversation to answer directly?
+3. If not, which research tool(s) would help gather the needed information?
+4. What arguments should I pass to each research tool?
+"""
+
+
+# Output contract appended to the instructions; the reply is parsed straight into ToolChoice
+TOOL_CHOICE_FORMAT = f"""
+Respond with a single JSON object, and nothing else, that matches this JSON schema:
+{json.dumps(ToolChoice.model_json_schema())}
+"""
+
+
+def _parse_tool_choice(raw: str) -> ToolChoice:
+    """Parse the model reply into a ToolChoice, ignoring any code fence or text around the JSON object."""
+    start, end = raw.find("{"), raw.rfind("}")
+    return ToolChoice.model_validate_json(raw[start:end + 1] if start != -1 and end > start else raw)
+
+
+# Conversation-history prefixes by LangChain message type; tool results are formatted with their tool name
+_HISTORY_PREFIXES = {"human": "<human>", "ai": "<assistant>", "system": "<system>"}
+
+# Tool choices are near-deterministic at this temperature, so repeated prompts reuse the earlier decision
+TOOL_CHOICE_TEMPERATURE = 0.1
+tool_choice_cache = PromptCache(maxsize=256)
+
+
+# Event loop on a daemon thread that runs every synchronous invoke, so LiteLLM's
+# per-loop HTTP clients and connections are reused instead of rebuilt per call
+_background_loop: asyncio.AbstractEventLoop | None = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="tool-wrapper-loop", daemon=True).start()
+            _background_loop = loop
+    return _background_loop
+
+
+def supports_prompt_caching(model: str) -> bool:
+    """Whether `model` needs explicit `cache_control` markers; OpenAI and Ollama cache stable prefixes on their own."""
+    return model.startswith(("anthropic/", "claude-"))
+
+
 class ToolWrapperLLM:
     """
-    Wrapper that adds tool calling capability to any LLM using Instructor + LiteLLM.
+    Wrapper that adds tool calling capability to any LLM using LiteLLM JSON mode.
     
     This provides a drop-in replacement for LangChain's .bind_tools() functionality
     for models that don't natively support tool calling.
@@ -49,6 +118,7 @@ class ToolWrapperLLM:
         parallel_tool_calls: bool = True,
         tool_choice: str = "auto",
         max_tokens: int = None,
+        cache_responses: bool = True,
     ):
         """
         Initialize the tool wrapper.
@@ -59,102 +129,81 @@ class ToolWrapperLLM:
             parallel_tool_calls: Whether to allow parallel tool calls
             tool_choice: Tool choice strategy ("auto", "any", "none", or tool name)
             max_tokens: Maximum tokens for model responses (defaults to config value)
+            cache_responses: Whether identical prompts reuse the cached tool choice
         """
         # Convert model name for LiteLLM compatibility
         self.model = model
         self.tools = tools or []
         self.parallel_tool_calls = parallel_tool_calls
         self.tool_choice = tool_choice
-        self.max_tokens = max_tokens or Configuration().tool_wrapper_max_tokens
+        self.max_tokens = max_tokens or Configuration.from_runnable_config().tool_wrapper_max_tokens
+        self.cache_responses = cache_responses
         
         # Filter out think_tool since we'll handle that deterministically
         self.research_tools = [t for t in self.tools if getattr(t, 'name', '') != 'think_tool']
         
-        self.client = instructor.from_litellm(
-            litellm.acompletion,  # Use async completion
-            mode=instructor.Mode.JSON
-        )
-                    
         self._tool_descriptions = render_text_description(self.research_tools) if self.research_tools else "No tools available."
+        
+        # Stable prompt prefix, built once: tool descriptions plus instructions, marked cacheable where supported
+        self._static_prefix = f"""<available_research_tools>
+{self._tool_descriptions}
+</available_research_tools>
+
+{TOOL_SELECTION_INSTRUCTIONS}{TOOL_CHOICE_FORMAT}"""
+        if supports_prompt_caching(self.model):
+            self._prefix_message = {
+                "role": "system",
+                "content": [{"type": "text", "text": self._static_prefix, "cache_control": {"type": "ephemeral"}}],
+            }
+        else:
+            self._prefix_message = {"role": "system", "content": self._static_prefix}
     
     def _create_tool_prompt(self, messages: List[Dict]) -> str:
-        """Create a focused prompt for research tool selection only."""
+        """Create the per-turn part of the tool selection prompt: the conversation history."""
         
         # Convert the conversation history into a readable format
         formatted_history = []
+        append = formatted_history.append
         for msg in messages:
-            if hasattr(msg, 'type'):  # LangChain message
-                msg_type = getattr(msg, 'type', 'unknown')
-                content = getattr(msg, 'content', '')
-                
-                if msg_type == 'human':
-                    formatted_history.append(f"<human>: {content}")
-                elif msg_type == 'ai':
-                    formatted_history.append(f"<assistant>: {content}")
-                    # Include tool calls if present
-                    if hasattr(msg, 'tool_calls') and msg.tool_calls:
-                        for tool_call in msg.tool_calls:
-                            tool_name = tool_call.get('name', 'unknown_tool')
-                            tool_args = tool_call.get('args', {})
-                            formatted_history.append(f"<assistant_tool_call>: {tool_name}({tool_args})")
-                elif msg_type == 'system':
-                    formatted_history.append(f"<system>: {content}")
-                elif msg_type == 'tool':
-                    tool_name = getattr(msg, 'name', 'unknown_tool')
-                    formatted_history.append(f"<tool_result:{tool_name}>: {content}")
-                else:
-                    formatted_history.append(f"<{msg_type}>: {content}")
+            if isinstance(msg, BaseMessage):  # LangChain message
+                msg_type = msg.type
+                if msg_type == 'tool':
+                    append(f"<tool_result:{msg.name}>: {msg.content}")
+                    continue
+                append(f"{_HISTORY_PREFIXES.get(msg_type) or f'<{msg_type}>'}: {msg.content}")
+                # Include tool calls if present
+                if msg_type == 'ai' and (tool_calls := msg.tool_calls):
+                    formatted_history.extend(
+                        f"<assistant_tool_call>: {tool_call.get('name', 'unknown_tool')}({tool_call.get('args', {})})"
+                        for tool_call in tool_calls
+                    )
             elif isinstance(msg, dict):
                 # Convert dict to readable format
-                role = msg.get('role', 'unknown')
-                content = msg.get('content', '')
-                formatted_history.append(f"<{role}>: {content}")
+                append(f"<{msg.get('role', 'unknown')}>: {msg.get('content', '')}")
         
         conversation = "\n".join(formatted_history)
         
+        # Only the conversation changes between turns; tools and instructions live in the cached prefix
         prompt = f"""
 <conversation_history>
 {conversation}
 </conversation_history>
-
-<available_research_tools>
-{self._tool_descriptions}
-</available_research_tools>
-
-You are a research assistant. Based on this conversation, analyze if any RESEARCH TOOLS should be used to gather more information.
-
-Your focus should be on calling research tools to gather information:
-- **search_documents**: Search internal knowledge base 
-- **web_meta_search_tool**: Search the web for current information
-- **get_document_by_id**: Retrieve specific documents
-
-Guidelines for research tool usage:
-1. Use research tools when you need to search for information or access external systems
-2. Don't use tools if you can answer directly from conversation context
-3. If multiple research tools are needed, you can call them in parallel
-4. Always provide reasoning for your tool choice decisions
-5. Focus on RESEARCH TOOLS ONLY - thinking will be handled separately
-
-Think step by step:
-1. What information is the human asking for?
-2. Do I have enough information from the conversation to answer directly?
-3. If not, which research tool(s) would help gather the needed information?
-4. What arguments should I pass to each research tool?
-
 """
         return prompt
     
-    async def ainvoke(self, messages: List[Any]) -> AIMessage:
+    async def ainvoke(self, messages: List[Any], bypass_cache: bool = False) -> AIMessage:
         """
         Async version of invoke that processes messages and returns an AIMessage with tool calls.
+
+        Identical prompts to the same model reuse the cached tool choice unless `bypass_cache` is set.
         """
         prompt = self._create_tool_prompt(messages)
         
         try:
-            # Extract the actual content from messages for LiteLLM
-            formatted_messages = []
+            # Extract the actual content from messages for LiteLLM, after the stable prefix
+            formatted_messages = [self._prefix_message]
             for msg in messages:
-                if hasattr(msg, 'type') and hasattr(msg, 'content'):
+                if isinstance(msg, BaseMessage):
                     role = "user" if msg.type == "human" else "assistant" if msg.type == "ai" else "system"
                     formatted_messages.append({"role": role, "content": str(msg.content)})
                 elif isinstance(msg, dict):
@@ -163,14 +212,33 @@ Think step by step:
             # Add the tool analysis prompt as the latest user message
             formatted_messages.append({"role": "user", "content": prompt})
             
-            # Get structured output from the model
-            result = await self.client.chat.completions.create(
-                model=self.model,
-                messages=formatted_messages,
-                response_model=ToolChoice,
-                max_tokens=self.max_tokens,
-                temperature=0.1
-            )
+            use_cache = self.cache_responses and not bypass_cache
+            cache_prompt = json.dumps(formatted_messages, sort_keys=True, ensure_ascii=False, default=str) if use_cache else ""
+            cached = tool_choice_cache.get(self.model, cache_prompt) if use_cache else None
+            if cached is not None:
+                result = ToolChoice.model_validate_json(cached)
+            else:
+                # Imported on first use; the native tool-binding path never needs it here
+                import litellm
+
+                # Get structured output from the model in JSON mode, with one retry for a malformed reply
+                for attempt in range(2):
+                    response = await litellm.acompletion(
+                        model=self.model,
+                        messages=formatted_messages,
+                        response_format={"type": "json_object"},
+                        max_tokens=self.max_tokens,
+                        temperature=TOOL_CHOICE_TEMPERATURE
+                    )
+                    try:
+                        result = _parse_tool_choice(response.choices[0].message.content or "")
+                        break
+                    except ValidationError as e:
+                        if attempt:
+                            raise
+                        logger.debug(f"Malformed tool choice from {self.model}, retrying: {e}")
+                if use_cache:
+                    tool_choice_cache.set(self.model, cache_prompt, result.model_dump_json())
             
             # Convert to AIMessage format
             if result.should_use_tool and result.tool_calls:
@@ -202,22 +270,9 @@ Think step by step:
         
     def invoke(self, messages: List[Any]) -> AIMessage:
         """
-        Synchronous version of ainvoke.
+        Synchronous version of ainvoke, run on the shared background event loop.
         """
-        try:
-            # Try to get existing event loop
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If loop is running, we need to use run_in_executor or similar
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(asyncio.run, self.ainvoke(messages))
-                    return future.result()
-            else:
-                return loop.run_until_complete(self.ainvoke(messages))
-        except RuntimeError:
-            # No event loop, create new one
-            return asyncio.run(self.ainvoke(messages))
+        return asyncio.run_coroutine_threadsafe(self.ainvoke(messages), _get_background_loop()).result()
 
 
 def bind_tools_with_instructor(
@@ -274,23 +329,31 @@ def normalize_tool_calls(tool_calls):
             "args": {}
         }
         
+        is_research = tc.get("name") == "ConductResearch"
+        
         # Extract args properly based on different possible formats
         args = tc.get("args", {})
         if isinstance(args, dict):
             norm_tc["args"] = args
         elif isinstance(args, str):
             # Try to parse JSON string args
-            try:
-                norm_tc["args"] = json.loads(args)
-            except:
-                # If not valid JSON, use as single argument
-                if tc.get("name") == "ConductResearch":
-                    norm_tc["args"] = {"research_topic": args}
-                else:
-                    norm_tc["args"] = {"text": args}
+            if args == "{}":
+                parsed = {}
+            else:
+                try:
+                    parsed = orjson.loads(args)
+                except ValueError:
+                    parsed = None
+            if isinstance(parsed, dict):
+                norm_tc["args"] = parsed
+            elif is_research:
+                # If not a JSON object, use as single argument
+                norm_tc["args"] = {"research_topic": args}
+            else:
+                norm_tc["args"] = {"text": args}
         
         # For ConductResearch, ensure research_topic exists
-        if tc.get("name") == "ConductResearch" and "research_topic" not in norm_tc["args"]:
+        if is_research and "research_topic" not in norm_tc["args"]:
             # If there's only one arg and it's not named, assume it's research_topic
             if len(norm_tc["args"]) == 1 and "text" in norm_tc["args"]:
                 norm_tc["args"]["research_topic"] = norm_tc["args"]["text"]
@@ -304,7 +367,7 @@ def normalize_tool_calls(tool_calls):
     
     return normalized_calls
 
-def create_model_with_tools(llm: LLM, tools: List[BaseTool], config_dict: dict, retries: int = 3, max_tokens: int = None):
+def create_model_with_tools(llm: "LLM", tools: List[BaseTool], config_dict: dict, retries: int = 3, max_tokens: int = None):
     """
     Create a model with tools, using smart fallback from native to wrapper.
     
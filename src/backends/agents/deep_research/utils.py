@@ -1,9 +1,14 @@
 """Utility functions and helpers for the Deep Research agent."""
 
+import asyncio
+import functools
 from datetime import datetime, timezone
+from types import MappingProxyType
 from typing import List
+import tiktoken
+from langchain_core.messages import ToolMessage
 from langchain_core.runnables import RunnableConfig
-from langchain_core.tools import BaseTool, tool
+from langchain_core.tools import BaseTool, render_text_description, tool
 from loguru import logger
 
 from .tools import tools_list as custom_tools
@@ -42,6 +47,21 @@ def think_tool(reflection: str) -> str:
     return f"Reflection recorded: {reflection}"
 
 
+@functools.cache
+def get_tool_bundle() -> tuple[tuple[BaseTool, ...], str, dict[str, BaseTool]]:
+    """
+    Build the research tools once, with their rendered description and a name lookup.
+
+    The tool set is static, so every researcher iteration shares this bundle.
+    """
+    tools = (tool(ResearchComplete), think_tool, *custom_tools)
+    tools_by_name = {
+        t.name if hasattr(t, "name") else t.get("name", "web_search"): t
+        for t in tools
+    }
+    return tools, render_text_description(list(tools)), tools_by_name
+
+
 async def get_all_tools(config: RunnableConfig = None) -> List[BaseTool]:
     """
     Get all available tools for the research agent.
@@ -49,13 +69,62 @@ async def get_all_tools(config: RunnableConfig = None) -> List[BaseTool]:
     Returns:
         List of research tools only (think_tool handled deterministically)
     """
-    tools = [tool(ResearchComplete), think_tool]
-    
-    tools.extend(custom_tools)
-    
-    return tools
+    return list(get_tool_bundle()[0])
+
 
+async def _ainvoke_tool_safely(tool: BaseTool | None, tool_name: str, args: dict, config: RunnableConfig):
+    if tool is None:
+        return f"Error executing tool: unknown tool '{tool_name}'"
+    try:
+        return await tool.ainvoke(args, config)
+    except Exception as e:
+        return f"Error executing tool: {str(e)}"
 
+
+async def aexecute_tool_calls(
+    tool_calls: list[dict], tools_by_name: dict[str, BaseTool], config: RunnableConfig = None
+) -> list[ToolMessage]:
+    """
+    Run independent tool calls concurrently, one ToolMessage per call in call order.
+
+    Research tools only read, so a turn costs as long as its slowest call. A failing
+    or unknown tool becomes an error message instead of failing its siblings.
+    """
+    if not tool_calls:
+        return []
+    observations = await asyncio.gather(*(
+        _ainvoke_tool_safely(tools_by_name.get(tc["name"]), tc["name"], tc["args"], config)
+        for tc in tool_calls
+    ))
+    return [
+        ToolMessage(
+            content=str(observation),
+            name=tool_call["name"],
+            tool_call_id=tool_call.get("id")
+        ) for observation, tool_call in zip(observations, tool_calls)
+    ]
+
+
+# Default token limits for common models
+MODEL_TOKEN_LIMITS = MappingProxyType({
+    # OpenAI models
+    "gpt-4": 8192,
+    "gpt-4-turbo": 128000,
+    "gpt-4o": 128000,
+    "gpt-3.5-turbo": 4096,
+    
+    # Anthropic models
+    "claude-3-opus": 200000,
+    "claude-3-sonnet": 200000,
+    "claude-3-haiku": 200000,
+    "claude-3-5-sonnet": 200000,
+})
+DEFAULT_TOKEN_LIMIT = 4096
+# Longest keys first, so "gpt-4o-mini" matches "gpt-4o" rather than "gpt-4"
+_TOKEN_LIMITS_BY_LENGTH = sorted(MODEL_TOKEN_LIMITS.items(), key=lambda item: -len(item[0]))
+
+
+@functools.lru_cache(maxsize=256)
 def get_model_token_limit(model_name: str) -> int:
     """
     Get the token limit for a given model.
@@ -66,35 +135,23 @@ def get_model_token_limit(model_name: str) -> int:
     Returns:
         The token limit for the model
     """
-    # Default token limits for common models
-    token_limits = {
-        # OpenAI models
-        "gpt-4": 8192,
-        "gpt-4-turbo": 128000,
-        "gpt-4o": 128000,
-        "gpt-3.5-turbo": 4096,
-        
-        # Anthropic models
-        "claude-3-opus": 200000,
-        "claude-3-sonnet": 200000,
-        "claude-3-haiku": 200000,
-        "claude-3-5-sonnet": 200000,
-        
-        # Default fallback
-        "default": 4096
-    }
-    
     # Check for exact match first
-    if model_name in token_limits:
-        return token_limits[model_name]
+    if model_name in MODEL_TOKEN_LIMITS:
+        return MODEL_TOKEN_LIMITS[model_name]
     
     # Check for partial matches
-    for model_key, limit in token_limits.items():
-        if model_key in model_name.lower():
-            return limit
-    
-    # Return default if no match found
-    return token_limits["default"]
+    name = model_name.lower()
+    return next((limit for model_key, limit in _TOKEN_LIMITS_BY_LENGTH if model_key in name), DEFAULT_TOKEN_LIMIT)
+
+
+@functools.lru_cache(maxsize=1)
+def _token_encoding():
+    """The cl100k_base BPE, loaded once; None when it cannot be loaded (e.g. offline on first use)."""
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"Token encoding unavailable, estimating 4 characters per token: {e}")
+        return None
 
 
 def is_token_limit_exceeded(content: str, model_name: str, buffer: int = 1000) -> bool:
@@ -109,36 +166,51 @@ def is_token_limit_exceeded(content: str, model_name: str, buffer: int = 1000) -
     Returns:
         True if the content would exceed the token limit
     """
-    # Rough estimate: 1 token ≈ 4 characters
-    estimated_tokens = len(content) // 4
+    available = get_model_token_limit(model_name) - buffer
+    # A token covers at least one UTF-8 byte, so short content never needs encoding
+    if len(content) * 4 <= available:
+        return False
     
-    limit = get_model_token_limit(model_name)
+    encoding = _token_encoding()
+    if encoding is None:
+        # Rough estimate: 1 token ≈ 4 characters
+        return len(content) // 4 > available
+    return len(encoding.encode(content, disallowed_special=())) > available
+
+
+# Phrases providers use when a prompt does not fit the model's context window
+_CONTEXT_WINDOW_MARKERS = ("context length", "maximum context", "context window", "prompt is too long")
+
+
+def is_context_window_error(error: BaseException) -> bool:
+    """
+    Check if an error is a provider rejecting a prompt that exceeds the model's context window.
     
-    return estimated_tokens > (limit - buffer)
+    Args:
+        error: The exception raised by the model call
+        
+    Returns:
+        True if the error is a context-window overflow
+    """
+    import litellm
+
+    if isinstance(error, litellm.ContextWindowExceededError):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in _CONTEXT_WINDOW_MARKERS)
 
 
 def get_notes_from_tool_calls(messages):
     """Extract notes from tool call results."""
-    notes = []
-    for msg in messages:
-        if hasattr(msg, 'type') and msg.type == 'tool':
-            notes.append(str(msg.content))
-    return notes
+    return [str(msg.content) for msg in messages if getattr(msg, 'type', None) == 'tool']
 
 
 def remove_up_to_last_ai_message(messages):
     """Remove messages up to the last AI message to handle token limits."""
-    if not messages:
-        return messages
-    
-    # Find last AI message
-    last_ai_index = -1
-    for i, msg in enumerate(messages):
-        if hasattr(msg, 'type') and msg.type == 'ai':
-            last_ai_index = i
-    
-    if last_ai_index >= 0:
-        return messages[last_ai_index:]
+    # Find last AI message, scanning back from the end where it usually is
+    for i in range(len(messages) - 1, -1, -1):
+        if getattr(messages[i], 'type', None) == 'ai':
+            return messages[i:]
     return messages
 
 
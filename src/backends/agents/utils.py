@@ -1,3 +1,6 @@
+import asyncio
+import hashlib
+from collections import OrderedDict
 from typing import Any
 
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
@@ -31,3 +34,100 @@ def truncate_think_tag(text: str) -> str:
     if "<think>" in text and "</think>" in text:
         return text.split("<think>")[0].strip() + text.split("</think>")[1].strip()
     return text.strip()
+
+
+class PromptCache:
+    """
+    Small LRU cache for short LLM completions such as search queries and titles.
+
+    Entries are keyed by a hash of the model name and the whitespace-normalized prompt,
+    so repeated prompts across sessions skip the LLM round-trip.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    @staticmethod
+    def _key(model: str, prompt: str) -> str:
+        normalized = " ".join(prompt.split())
+        return hashlib.sha256(f"{model}\x00{normalized}".encode()).hexdigest()
+
+    def get(self, model: str, prompt: str) -> str | None:
+        key = self._key(model, prompt)
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, model: str, prompt: str, value: str) -> None:
+        key = self._key(model, prompt)
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class BatchingLLMProxy:
+    """
+    Coalesces short, independent `ainvoke` calls into `abatch` calls.
+
+    Prompts submitted in the same event-loop turn (e.g. from one `asyncio.gather`) are
+    sent together with an explicit `max_concurrency`, since Runnable.abatch otherwise
+    falls back to its default concurrency. The batch is flushed on the next turn, so
+    no fixed delay is added. Other attributes are forwarded to the wrapped model.
+    """
+
+    def __init__(self, llm: Any, max_concurrency: int = 8):
+        self.llm = llm
+        self.max_concurrency = max_concurrency
+        self._pending: list[tuple[Any, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.llm, name)
+
+    async def ainvoke(self, input: Any, **kwargs: Any) -> Any:
+        if kwargs:
+            # Per-call options can't be shared across a batch
+            return await self.llm.ainvoke(input, **kwargs)
+        return await self.submit(input)
+
+    async def submit(self, input: Any) -> Any:
+        """Queue `input` for the next batch and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((input, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+        return await future
+
+    async def _flush(self):
+        batch: list[tuple[Any, asyncio.Future]] = []
+        try:
+            # Yield once so callers already scheduled in this turn can join the batch
+            await asyncio.sleep(0)
+            batch, self._pending = self._pending, []
+            self._flush_task = None
+            try:
+                results = await self.llm.abatch(
+                    [input for input, _ in batch],
+                    config={"max_concurrency": self.max_concurrency},
+                    return_exceptions=True,
+                )
+            except Exception as e:
+                results = [e] * len(batch)
+        except asyncio.CancelledError:
+            for _, future in batch or self._pending:
+                future.cancel()
+            if not batch:
+                self._pending = []
+                self._flush_task = None
+            raise
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -5,6 +5,7 @@ Simplified factory for creating ChatLiteLLM instances.
 """
 
 import os
+from collections import OrderedDict
 from typing import Any, Optional
 
 from loguru import logger
@@ -14,6 +15,11 @@ from .chatlitellm import LLM
 from .env_parser import EnvVarParser
 from .env_parser_db import EnvVarParserDB
 
+# LLM instances keyed by their resolved constructor arguments, shared by every agent using the same model
+# and credentials; changed credentials produce a new key
+MAX_CACHED_LLMS = 16
+_llm_cache: OrderedDict[tuple, LLM] = OrderedDict()
+
 
 class LLMFactory:
     """Simplified factory for creating ChatLiteLLM instances."""
@@ -85,8 +91,18 @@ class LLMFactory:
             if "max_retries" in env_credentials:
                 llm_args["max_retries"] = env_credentials["max_retries"]
 
+            cache_key = tuple(sorted(llm_args.items()))
+            llm = _llm_cache.get(cache_key)
+            if llm is not None:
+                _llm_cache.move_to_end(cache_key)
+                return llm
+
             logger.debug(f"Creating LLM with args: {list(llm_args.keys())}")
-            return LLM(**llm_args)
+            llm = LLM(**llm_args)
+            _llm_cache[cache_key] = llm
+            if len(_llm_cache) > MAX_CACHED_LLMS:
+                _llm_cache.popitem(last=False)
+            return llm
         except Exception as e:
             raise e
 
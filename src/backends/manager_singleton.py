@@ -110,6 +110,11 @@ class ManagerSingleton:
             # Clear agent cache to force recreation with new config
             cls._session_manager.agents.clear()
 
+        # Active knowledge bases live in the user config
+        from .tools.utils import invalidate_active_knowledge_bases_cache
+
+        invalidate_active_knowledge_bases_cache()
+
     @classmethod
     def get_encryption_key(cls) -> str | None:
         """Get the cached encryption key."""
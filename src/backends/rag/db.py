@@ -23,6 +23,11 @@ client = chromadb.PersistentClient(
 _executor = ThreadPoolExecutor(max_workers=2)  # Reduced to avoid overwhelming ChromaDB
 
 
+async def run_in_chroma_executor(func, *args):
+    """Run a blocking ChromaDB call on the shared, size-limited thread pool."""
+    return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+
+
 async def get_embeddings_for_kb(kb_id: str):
     """Return embedding function configured for given KB id."""
     db_manager = await get_database_manager()
@@ -186,6 +191,21 @@ class RAGDB:
             logger.error(f"ChromaDB query failed: {e}")
             raise e
 
+    def prewarm_collection(self, collection_name: str) -> bool:
+        """
+        Load a collection's vector index into memory ahead of the first real query.
+
+        Queries with a stored embedding, so no embedding provider call is made.
+        Returns False for empty collections.
+        """
+        collection = self.client.get_collection(name=collection_name)
+        sample = collection.get(limit=1, include=["embeddings"])
+        embeddings = sample.get("embeddings")
+        if embeddings is None or len(embeddings) == 0:
+            return False
+        collection.query(query_embeddings=[embeddings[0]], n_results=1, include=[])
+        return True
+
     def get_documents_by_metadata(
         self, collection_name: str, where: dict[str, Any], include_content: bool = True
     ) -> list[dict[str, Any]]:
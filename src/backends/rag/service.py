@@ -16,7 +16,7 @@ from loguru import logger
 from ..constants import CHUNK_OVERLAP, CHUNK_SIZE
 from ..database import get_database_manager
 from ..manager_singleton import ManagerSingleton
-from .db import RAGDB, add_documents_to_kb
+from .db import RAGDB, add_documents_to_kb, run_in_chroma_executor
 from .embedding import get_embedding_function
 
 
@@ -589,13 +589,16 @@ class RAGService:
                 embeddings = await get_embedding_function(model_name)
                 rag_db = RAGDB(embeddings=embeddings)
                 for kb_id in kb_ids:
-                    query_result = rag_db.query(
-                        query_text=query_text,
-                        collection_name=kb_id,
-                        k=k,
-                        keys=keys,
-                        where=where,
-                        where_document=where_document,
+                    # Embedding the query and the vector search both block, so they run on the executor
+                    query_result = await run_in_chroma_executor(
+                        lambda kb_id=kb_id: rag_db.query(
+                            query_text=query_text,
+                            collection_name=kb_id,
+                            k=k,
+                            keys=keys,
+                            where=where,
+                            where_document=where_document,
+                        ),
                     )
                     for i in range(len(query_result["documents"][0])):
                         all_results.append(
@@ -612,6 +615,23 @@ class RAGService:
         except HTTPException:
             raise
 
+    @staticmethod
+    async def prewarm_active_knowledge_bases() -> None:
+        """Load the vector indexes of the active knowledge bases so the first chat query doesn't pay for it."""
+        try:
+            kb_ids = await RAGService.get_active_knowledge_bases_validated()
+        except Exception as e:
+            logger.warning(f"Skipping knowledge base prewarm: {e}")
+            return
+
+        rag_db = RAGDB(embeddings=None)
+        for kb_id in kb_ids:
+            try:
+                await run_in_chroma_executor(rag_db.prewarm_collection, kb_id)
+                logger.debug(f"Prewarmed knowledge base index: {kb_id}")
+            except Exception as e:
+                logger.warning(f"Failed to prewarm knowledge base {kb_id}: {e}")
+
     @staticmethod
     def _clean_metadata_for_chromadb(metadata: dict[str, Any]) -> dict[str, Any]:
         """Convert list values to strings for ChromaDB compatibility."""
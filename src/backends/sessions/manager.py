@@ -23,6 +23,16 @@ from .session import Session
 # Set up logging
 # logger is imported from loguru
 
+# Applied to the checkpointer connection so memory-graph writes don't block readers;
+# the WAL is truncated back to 64 MiB after checkpoints instead of keeping its peak size
+CHECKPOINTER_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA journal_size_limit=67108864;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+"""
+
 
 class SessionManager:
     """Lightweight session manager - agents decide what they need."""
@@ -80,6 +90,7 @@ class SessionManager:
             logger.debug("Initializing checkpointer for LangGraph.")
             self.checkpointer_context = AsyncSqliteSaver.from_conn_string(self.db_path)
             self.checkpointer = await self.checkpointer_context.__aenter__()
+            await self.checkpointer.conn.executescript(CHECKPOINTER_PRAGMAS)
         return self.checkpointer
 
     async def stream_response(
@@ -118,21 +129,26 @@ class SessionManager:
 
             # The agent's stream_response should return an async generator
             response_chunks_for_saving = []
-            async for chunk in agent.stream(message, session, context, request):
-                if request and await request.is_disconnected():
-                    logger.warning(f"Client disconnected during streaming for session {session_id}.")
-                    break
-
-                # Ensure chunk is a dictionary before yielding
-                if isinstance(chunk, dict):
-                    yield chunk
-                    if chunk.get("type") == "content":
-                        response_chunks_for_saving.append(str(chunk.get("data", "")))
-                elif isinstance(chunk, str):
-                    # Wrap string chunks for backward compatibility
-                    event = {"type": "content", "data": chunk}
-                    yield event
-                    response_chunks_for_saving.append(chunk)
+            # A single monitor task flips the event on disconnect, so each chunk only checks a flag
+            cancellation_event, monitor_task = agent.create_cancellation_monitor(request)
+            try:
+                async for chunk in agent.stream(message, session, context, request):
+                    if cancellation_event.is_set():
+                        logger.warning(f"Client disconnected during streaming for session {session_id}.")
+                        break
+
+                    # Ensure chunk is a dictionary before yielding
+                    if isinstance(chunk, dict):
+                        yield chunk
+                        if chunk.get("type") == "content":
+                            response_chunks_for_saving.append(str(chunk.get("data", "")))
+                    elif isinstance(chunk, str):
+                        # Wrap string chunks for backward compatibility
+                        event = {"type": "content", "data": chunk}
+                        yield event
+                        response_chunks_for_saving.append(chunk)
+            finally:
+                await agent.cleanup_cancellation_monitor(cancellation_event, monitor_task)
 
             # Persist history for agents
             try:
@@ -187,10 +203,13 @@ class SessionManager:
                     metadata={"error": "unsupported_agent_type"},
                 )
 
-            # Use stream_response internally and collect chunks
+            # Use stream_response internally and collect the streamed content
             response_chunks = []
             async for chunk in self.stream_response(message, session_id, agent_type, context):
-                response_chunks.append(chunk)
+                if chunk.get("type") == "content":
+                    response_chunks.append(str(chunk.get("data", "")))
+                elif chunk.get("type") == "error":
+                    raise RuntimeError(chunk.get("data", {}).get("message", "Streaming failed"))
 
             full_response = "".join(response_chunks)
 
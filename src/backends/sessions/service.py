@@ -6,16 +6,24 @@ separated from the API layer for better maintainability.
 """
 
 import asyncio
-import json
 from datetime import datetime
 from typing import Any
 
+import orjson
 from fastapi import HTTPException, Request
 from fastapi.responses import StreamingResponse
 
 from ..agents.agent_response import AgentResponse
 from .manager import SessionManager
 
+# Seconds of silence before an SSE keep-alive comment is sent
+KEEP_ALIVE_INTERVAL = 15
+
+
+def _dumps(event: Any) -> str:
+    # orjson is much faster than json on the many small SSE events
+    return orjson.dumps(event).decode()
+
 
 class SessionsService:
     """Service class for session management operations."""
@@ -82,70 +90,53 @@ class SessionsService:
         """Stream a message response from a specific session using SSE."""
 
         async def sse_generator():
-            """Generator that yields SSE-formatted messages."""
-            queue = asyncio.Queue()
-            finished = asyncio.Event()
-
-            async def stream_producer():
-                """Puts events from the session manager into the queue."""
-                try:
-                    async for event in session_manager.stream_response(
-                        message=message,
-                        session_id=session_id,
-                        agent_type=agent_type,
-                        context=context,
-                        request=request,
-                    ):
-                        if request and await request.is_disconnected():
-                            break
-                        await queue.put(event)
-                except Exception as e:
-                    error_event = {"type": "error", "data": {"message": str(e)}}
-                    await queue.put(error_event)
-                finally:
-                    await asyncio.sleep(0.1)
-                    finished.set()
-
-            async def keep_alive_sender():
-                """Sends a keep-alive comment every 15 seconds."""
-                while not finished.is_set():
-                    try:
-                        await asyncio.wait_for(finished.wait(), timeout=15)
-                    except TimeoutError:
-                        if not finished.is_set():
-                            await queue.put({"type": "keep-alive"})
-
-            producer_task = asyncio.create_task(stream_producer())
-            keep_alive_task = asyncio.create_task(keep_alive_sender())
+            """Generator that yields SSE-formatted messages.
+
+            Events are pulled straight from the session manager's stream. Each pull is raced
+            against the keep-alive interval, so an idle stream only wakes up to send a
+            keep-alive comment. Client disconnects are handled by Starlette cancelling
+            this generator.
+            """
+            events = session_manager.stream_response(
+                message=message,
+                session_id=session_id,
+                agent_type=agent_type,
+                context=context,
+                request=request,
+            )
+            next_event = asyncio.ensure_future(anext(events))
+            try:
+                while True:
+                    done, _ = await asyncio.wait({next_event}, timeout=KEEP_ALIVE_INTERVAL)
+                    if not done:
+                        yield ": keep-alive\n\n"
+                        continue
 
-            while not finished.is_set() or not queue.empty():
-                try:
-                    event = await asyncio.wait_for(queue.get(), timeout=0.1)
+                    try:
+                        event = next_event.result()
+                    except StopAsyncIteration:
+                        break
+                    except Exception as e:
+                        error_event = {"type": "error", "data": {"message": str(e)}}
+                        yield f"data: {_dumps(error_event)}\n\n"
+                        break
 
                     if isinstance(event, dict):
-                        if event.get("type") == "keep-alive":
-                            yield ": keep-alive\n\n"
-                        else:
-                            yield f"data: {json.dumps(event)}\n\n"
+                        yield f"data: {_dumps(event)}\n\n"
                     elif isinstance(event, str):
                         # For backward compatibility with agents yielding strings
                         payload = {"type": "content", "data": event}
-                        yield f"data: {json.dumps(payload)}\n\n"
-
-                    queue.task_done()
-                except TimeoutError:
-                    continue
+                        yield f"data: {_dumps(payload)}\n\n"
 
-            producer_task.cancel()
-            keep_alive_task.cancel()
-            try:
-                await producer_task
-            except asyncio.CancelledError:
-                pass
-            try:
-                await keep_alive_task
-            except asyncio.CancelledError:
-                pass
+                    next_event = asyncio.ensure_future(anext(events))
+            finally:
+                if not next_event.done():
+                    next_event.cancel()
+                    try:
+                        await next_event
+                    except (asyncio.CancelledError, StopAsyncIteration):
+                        pass
+                await events.aclose()
 
         headers = {
             "Content-Type": "text/event-stream; charset=utf-8",
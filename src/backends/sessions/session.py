@@ -12,7 +12,7 @@ from langchain_core.messages import BaseMessage
 from ..user_config import UserConfig
 
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     """
     A data class representing a single user session.
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from typing import Any
 
 from loguru import logger
@@ -6,6 +8,11 @@ from ..database import get_database_manager
 from ..manager_singleton import ManagerSingleton
 from ..zotero.service import zotero_service
 
+# Seconds a get_active_knowledge_bases_cached() result is reused
+ACTIVE_KB_CACHE_TTL = 10.0
+_active_kb_cache: dict[str, Any] = {"value": None, "expires": 0.0}
+_active_kb_lock = asyncio.Lock()
+
 
 async def get_active_knowledge_bases() -> list[dict[str, Any]]:
     """Helper function to get active knowledge bases directly from the database
@@ -35,6 +42,27 @@ async def get_active_knowledge_bases() -> list[dict[str, Any]]:
         return []
 
 
+async def get_active_knowledge_bases_cached() -> list[dict[str, Any]]:
+    """Same as get_active_knowledge_bases, reusing the result for ACTIVE_KB_CACHE_TTL seconds.
+
+    Meant for per-turn checks; config saves clear it via invalidate_active_knowledge_bases_cache.
+    """
+    if time.monotonic() < _active_kb_cache["expires"]:
+        return _active_kb_cache["value"]
+
+    async with _active_kb_lock:
+        # Another turn may have refreshed the cache while we waited for the lock
+        if time.monotonic() >= _active_kb_cache["expires"]:
+            _active_kb_cache["value"] = await get_active_knowledge_bases()
+            _active_kb_cache["expires"] = time.monotonic() + ACTIVE_KB_CACHE_TTL
+        return _active_kb_cache["value"]
+
+
+def invalidate_active_knowledge_bases_cache() -> None:
+    """Force the next get_active_knowledge_bases_cached call to hit the database."""
+    _active_kb_cache["expires"] = 0.0
+
+
 async def get_abstract_by_keys(keys: list[str]) -> dict[str, str]:
     """Return mapping of zotero item key -> abstractNote (may be empty string)."""
     result: dict[str, str] = {}
@@ -86,7 +86,20 @@ async def lifespan(app: FastAPI):
     main_loop = asyncio.get_running_loop()
     logger.info("Main event loop stored for stdin monitoring")
 
+    # Run new tasks eagerly until their first suspension (Python 3.12+), so short-lived
+    # tasks such as cancellation monitors and background memory updates skip a scheduler hop
+    if hasattr(asyncio, "eager_task_factory"):
+        main_loop.set_task_factory(asyncio.eager_task_factory)
+        logger.info("Eager task factory enabled")
+
     await ManagerSingleton.initialize()
+    # Bind the singleton once so request dependencies can read it straight from app.state
+    app.state.session_manager = await ManagerSingleton.get_session_manager()
+
+    # Load the active knowledge bases' vector indexes in the background so the first query is fast
+    from backends.rag.service import RAGService
+
+    prewarm_task = asyncio.create_task(RAGService.prewarm_active_knowledge_bases(), name="kb_prewarm")
 
     # Start the stdin monitor in a separate thread to watch for parent process exit
     stdin_thread = threading.Thread(target=stdin_monitor, daemon=True)
@@ -115,7 +128,7 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to start MCP server: {e}")
 
     watcher_task = asyncio.create_task(shutdown_watcher(), name="shutdown_watcher")
-    background_tasks = [watcher_task]
+    background_tasks = [watcher_task, prewarm_task]
     logger.info("Background services are running.")
     try:
         # Application is now running and ready to accept requests
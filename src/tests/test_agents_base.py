@@ -0,0 +1,135 @@
+"""
+Test suite for the base agent streaming wrapper.
+
+This module tests:
+- The stream always ends once the agent stops producing
+- Cancellation monitors share one disconnect watcher per request
+"""
+
+import asyncio
+
+import pytest
+
+# The sessions package and agents.base import each other; loading sessions first resolves the cycle
+import src.backends.sessions  # noqa: F401
+
+# isort: split
+from src.backends.agents.base import STREAM_QUEUE_SIZE, BaseAgent
+
+
+class ScriptedAgent(BaseAgent):
+    """Agent that yields a fixed number of content events and then raises `error`."""
+
+    def __init__(self, events: int, error: BaseException | None = None):
+        self.events = events
+        self.error = error
+
+    async def stream_response(self, message, session, context=None, request=None):
+        for i in range(self.events):
+            yield {"type": "content", "data": str(i)}
+        if self.error is not None:
+            raise self.error
+
+    def get_agent_info(self):
+        return {}
+
+
+async def collect(agent: BaseAgent) -> list[str]:
+    """Drain `agent.stream`, failing the test instead of hanging."""
+    async def drain():
+        return [event["data"] async for event in agent.stream("hi", None)]
+
+    return await asyncio.wait_for(drain(), timeout=5)
+
+
+class TestStream:
+    """Test suite for BaseAgent.stream."""
+
+    @pytest.mark.asyncio
+    async def test_completes_normally(self):
+        """Test that every event is delivered and the stream ends."""
+        assert await collect(ScriptedAgent(3)) == ["0", "1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_ends_when_the_agent_is_cancelled(self):
+        """Test that a CancelledError inside the agent ends the stream instead of hanging it."""
+        assert await collect(ScriptedAgent(2, asyncio.CancelledError())) == ["0", "1"]
+
+    @pytest.mark.asyncio
+    async def test_ends_when_cancelled_with_a_full_queue(self):
+        """Test that the stream ends after draining a full queue when the sentinel could not be queued."""
+        events = STREAM_QUEUE_SIZE + 1
+        agent = ScriptedAgent(events, asyncio.CancelledError())
+
+        async def slow_drain():
+            received = []
+            async for event in agent.stream("hi", None):
+                if not received:
+                    # Let the producer fill the queue and stop before anything is consumed
+                    await asyncio.sleep(0.05)
+                received.append(event["data"])
+            return received
+
+        received = await asyncio.wait_for(slow_drain(), timeout=5)
+        assert received == [str(i) for i in range(events)]
+
+    @pytest.mark.asyncio
+    async def test_agent_errors_are_raised_to_the_caller(self):
+        """Test that an ordinary exception from the agent reaches the consumer."""
+        with pytest.raises(RuntimeError, match="boom"):
+            await collect(ScriptedAgent(1, RuntimeError("boom")))
+
+
+class FakeRequest:
+    """ASGI-style request whose `receive` delivers each queued message to one reader only."""
+
+    def __init__(self):
+        self.messages: asyncio.Queue = asyncio.Queue()
+        self.readers = 0
+
+    async def receive(self):
+        self.readers += 1
+        try:
+            return await self.messages.get()
+        finally:
+            self.readers -= 1
+
+
+class TestCancellationMonitor:
+    """Test suite for request disconnect monitoring."""
+
+    @pytest.mark.asyncio
+    async def test_nested_monitors_share_one_disconnect(self):
+        """Test that a single http.disconnect message cancels every monitor on the request."""
+        agent = ScriptedAgent(0)
+        request = FakeRequest()
+        outer_event, outer_task = agent.create_cancellation_monitor(request)
+        inner_event, inner_task = agent.create_cancellation_monitor(request)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert request.readers == 1
+        await request.messages.put({"type": "http.disconnect"})
+        await asyncio.wait_for(asyncio.gather(outer_event.wait(), inner_event.wait()), timeout=1)
+
+        await agent.cleanup_cancellation_monitor(inner_event, inner_task)
+        await agent.cleanup_cancellation_monitor(outer_event, outer_task)
+
+    @pytest.mark.asyncio
+    async def test_watcher_stops_after_the_last_monitor(self):
+        """Test that the shared watcher keeps running for the outer monitor and stops after it."""
+        agent = ScriptedAgent(0)
+        request = FakeRequest()
+        outer_event, outer_task = agent.create_cancellation_monitor(request)
+        inner_event, inner_task = agent.create_cancellation_monitor(request)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        await agent.cleanup_cancellation_monitor(inner_event, inner_task)
+        await asyncio.sleep(0)
+        assert request.readers == 1
+
+        await agent.cleanup_cancellation_monitor(outer_event, outer_task)
+        await asyncio.sleep(0)
+        assert request.readers == 0
+        assert not hasattr(request, "_chiken_disconnect_watch")
@@ -0,0 +1,101 @@
+"""
+Test suite for the shared agent utilities.
+
+This module tests:
+- PromptCache lookups and LRU eviction
+- BatchingLLMProxy batching, result delivery and pass-through calls
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from src.backends.agents.utils import BatchingLLMProxy, PromptCache
+
+
+class TestPromptCache:
+    """Test suite for the prompt LRU cache."""
+
+    def test_get_normalizes_whitespace_and_scopes_by_model(self):
+        """Test that lookups ignore whitespace differences but not the model."""
+        cache = PromptCache()
+        cache.set("model-a", "what  is\nrag", "answer")
+
+        assert cache.get("model-a", "what is rag") == "answer"
+        assert cache.get("model-b", "what is rag") is None
+
+    def test_evicts_least_recently_used_entry(self):
+        """Test that the oldest unused entry is dropped once maxsize is exceeded."""
+        cache = PromptCache(maxsize=2)
+        cache.set("m", "first", "1")
+        cache.set("m", "second", "2")
+        assert cache.get("m", "first") == "1"  # "second" is now least recently used
+
+        cache.set("m", "third", "3")
+
+        assert cache.get("m", "second") is None
+        assert cache.get("m", "first") == "1"
+        assert cache.get("m", "third") == "3"
+
+
+class TestBatchingLLMProxy:
+    """Test suite for the ainvoke-to-abatch proxy."""
+
+    @pytest.fixture
+    def llm(self):
+        """Create a mock model whose abatch echoes its inputs."""
+        llm = Mock()
+        llm.abatch = AsyncMock(side_effect=lambda inputs, **kwargs: [f"out:{i}" for i in inputs])
+        llm.ainvoke = AsyncMock(return_value="direct")
+        return llm
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_are_flushed_as_one_batch(self, llm):
+        """Test that calls made together are sent in a single abatch call."""
+        proxy = BatchingLLMProxy(llm, max_concurrency=3)
+
+        results = await asyncio.gather(proxy.ainvoke("a"), proxy.ainvoke("b"), proxy.ainvoke("c"))
+
+        assert results == ["out:a", "out:b", "out:c"]
+        llm.abatch.assert_awaited_once_with(
+            ["a", "b", "c"], config={"max_concurrency": 3}, return_exceptions=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_flush_separately(self, llm):
+        """Test that a later call starts a new batch after the previous one flushed."""
+        proxy = BatchingLLMProxy(llm)
+
+        assert await proxy.ainvoke("a") == "out:a"
+        assert await proxy.ainvoke("b") == "out:b"
+        assert llm.abatch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_per_item_errors_are_delivered_to_their_caller(self, llm):
+        """Test that an exception in one batch slot only fails that call."""
+        error = RuntimeError("boom")
+        llm.abatch = AsyncMock(return_value=["ok", error])
+        proxy = BatchingLLMProxy(llm)
+
+        results = await asyncio.gather(proxy.ainvoke("a"), proxy.ainvoke("b"), return_exceptions=True)
+
+        assert results == ["ok", error]
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_is_delivered_to_every_caller(self, llm):
+        """Test that a failed abatch call fails all calls in the batch."""
+        llm.abatch = AsyncMock(side_effect=RuntimeError("down"))
+        proxy = BatchingLLMProxy(llm)
+
+        results = await asyncio.gather(proxy.ainvoke("a"), proxy.ainvoke("b"), return_exceptions=True)
+
+        assert [str(r) for r in results] == ["down", "down"]
+
+    @pytest.mark.asyncio
+    async def test_calls_with_options_bypass_the_batch(self, llm):
+        """Test that per-call options go straight to the wrapped model."""
+        proxy = BatchingLLMProxy(llm)
+
+        assert await proxy.ainvoke("a", stop=["\n"]) == "direct"
+        llm.ainvoke.assert_awaited_once_with("a", stop=["\n"])
+        llm.abatch.assert_not_awaited()
@@ -0,0 +1,107 @@
+"""
+Test suite for the chat graph helpers.
+
+This module tests:
+- History excerpts used in the RAG query prompt
+- Parsing of the memory analysis
+- Coalescing of streamed LLM tokens
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from src.backends.agents.chat_graph.agent import STREAM_FLUSH_INTERVAL, ChatAgent
+from src.backends.agents.chat_graph.graph import HISTORY_EXCERPT_HALF, _truncate_middle
+from src.backends.agents.chat_graph.memory import parse_memory_analysis
+from src.backends.sessions.session import Session
+from src.backends.user_config import create_chat_config
+
+
+class TestTruncateMiddle:
+    """Test suite for the history excerpt helper."""
+
+    def test_short_text_is_returned_unchanged(self):
+        """Test that text fitting in the excerpt is not split or duplicated."""
+        text = "x" * (2 * HISTORY_EXCERPT_HALF)
+
+        assert _truncate_middle("hello") == "hello"
+        assert _truncate_middle(text) == text
+
+    def test_long_text_keeps_head_and_tail(self):
+        """Test that long text keeps both ends around an ellipsis."""
+        head = "h" * HISTORY_EXCERPT_HALF
+        tail = "t" * HISTORY_EXCERPT_HALF
+        text = head + "middle" + tail
+
+        assert _truncate_middle(text) == f"{head} ... {tail}"
+
+
+class TestParseMemoryAnalysis:
+    """Test suite for the memory analysis parser."""
+
+    def test_parses_each_section(self):
+        """Test that topics, preferences and important lines are extracted case-insensitively."""
+        analysis = (
+            "Here is the analysis.\n"
+            "Topics: rag, vector search\n"
+            "  PREFERENCES : language: python, style: terse\n"
+            "important: deadline is friday\n"
+            "other: ignored"
+        )
+
+        assert parse_memory_analysis(analysis) == {
+            "topics": ["rag", "vector search"],
+            "preferences": {"language": "python", "style": "terse"},
+            "important": ["deadline is friday"],
+        }
+
+    def test_placeholders_and_missing_sections_are_empty(self):
+        """Test that template placeholders and 'none' values are ignored."""
+        analysis = "Topics: none\nPreferences: [key: value pairs]\nImportant:"
+
+        assert parse_memory_analysis(analysis) == {"topics": [], "preferences": {}, "important": []}
+
+    def test_section_names_only_match_at_line_start(self):
+        """Test that section names inside a sentence are not parsed."""
+        assert parse_memory_analysis("The topics: a, b were discussed")["topics"] == []
+
+
+class StallingLLM:
+    """Streams one short chunk, stalls, then streams another."""
+
+    def __init__(self, stall: float):
+        self.stall = stall
+
+    async def astream(self, messages, cancellation_event=None):
+        yield SimpleNamespace(message=SimpleNamespace(content="Hello"))
+        await asyncio.sleep(self.stall)
+        yield SimpleNamespace(message=SimpleNamespace(content=" world"))
+
+
+class TestChatAgentStreaming:
+    """Test suite for token coalescing in ChatAgent.stream_response."""
+
+    @pytest.mark.asyncio
+    async def test_buffered_text_is_flushed_while_the_model_stalls(self):
+        """Test that a short chunk is sent after the flush interval instead of waiting for the next chunk."""
+        stall = 20 * STREAM_FLUSH_INTERVAL
+        agent = ChatAgent.__new__(ChatAgent)
+        agent.graphs = SimpleNamespace(
+            rag_app=SimpleNamespace(ainvoke=AsyncMock(return_value={})),
+            generation_app=SimpleNamespace(ainvoke=AsyncMock(return_value={"prepared_messages": ["prompt"]})),
+            llm=StallingLLM(stall),
+        )
+        session = Session(session_id="s", user_config=create_chat_config())
+        loop = asyncio.get_running_loop()
+
+        started = loop.time()
+        received = []
+        with patch.object(ChatAgent, "_schedule_memory_update"):
+            async for event in agent.stream_response("hi", session):
+                if isinstance(event, str):
+                    received.append((event, loop.time() - started))
+
+        assert [text for text, _ in received] == ["Hello", " world"]
+        assert received[0][1] < stall / 2
@@ -0,0 +1,126 @@
+"""
+Test suite for the Deep Research agent's report caching.
+
+This module tests that only complete reports are cached or shared with
+identical requests that join a run in progress.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+from src.backends.agents.deep_research.agent import DeepResearchAgent
+from src.backends.agents.deep_research.state import AgentState
+from src.backends.user_config import create_chat_config
+
+ERROR_REPORT = {"final_report": "Error generating final report: boom", "final_report_error": True}
+PARTIAL_REPORT = {"final_report": "Half a report\n\n[Report interrupted: net]", "final_report_partial": True}
+REPORT = {"final_report": "Full report"}
+
+
+def report_graph(output: dict):
+    """A graph whose only node returns `output` as the final report."""
+
+    async def final_report_generation(state: AgentState):
+        return output
+
+    builder = StateGraph(AgentState)
+    builder.add_node("final_report_generation", final_report_generation)
+    builder.add_edge(START, "final_report_generation")
+    builder.add_edge("final_report_generation", END)
+    return builder.compile()
+
+
+def make_agent(output: dict, **config) -> DeepResearchAgent:
+    """An agent with a constant embedder whose graph only produces `output`."""
+    agent = DeepResearchAgent(create_chat_config(**config), llm=None, embedder=lambda texts: [[1.0, 0.0]])
+    agent.graph = report_graph(output)
+    return agent
+
+
+async def run(agent: DeepResearchAgent, message: str) -> list[str]:
+    """Collect the content events of one request."""
+    session = SimpleNamespace(messages=[])
+    return [event["data"] async for event in agent.stream_response(message, session) if event["type"] == "content"]
+
+
+class TestReportCaching:
+    """Test suite for which reports reach the caches."""
+
+    @pytest.mark.asyncio
+    async def test_complete_report_is_cached(self):
+        """Test that a complete report is stored in the semantic cache."""
+        agent = make_agent(REPORT)
+
+        await run(agent, "what is rag")
+
+        assert await agent._cache.lookup([1.0, 0.0], next(iter(agent._cache._entries))) == REPORT
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("output", [ERROR_REPORT, PARTIAL_REPORT])
+    async def test_failed_report_is_not_semantically_cached(self, output):
+        """Test that error and partial reports never enter the semantic cache."""
+        agent = make_agent(output)
+
+        await run(agent, "what is rag")
+
+        assert not agent._cache._entries
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("output", [ERROR_REPORT, PARTIAL_REPORT])
+    async def test_failed_report_is_not_exact_cached(self, output):
+        """Test that a verbatim rerun at temperature 0 runs the research again after a failure."""
+        agent = make_agent(output, temperature=0)
+
+        await run(agent, "what is rag")
+        agent.graph = report_graph(REPORT)
+
+        assert "Full report" in await run(agent, "what is rag")
+
+    @pytest.mark.asyncio
+    async def test_complete_report_is_exact_cached(self):
+        """Test that a verbatim rerun at temperature 0 is answered from the exact cache."""
+        agent = make_agent(REPORT, temperature=0)
+
+        await run(agent, "what is rag")
+        agent.graph = report_graph(ERROR_REPORT)
+
+        assert await run(agent, "what is rag") == ["Full report"]
+
+
+class TestJoinedRuns:
+    """Test suite for requests that join an identical run in progress."""
+
+    @pytest.mark.asyncio
+    async def test_joiner_runs_its_own_research_when_the_leader_fails(self):
+        """Test that a joined request does not receive the leader's error report."""
+        leader_started = asyncio.Event()
+        release_leader = asyncio.Event()
+        outputs = [ERROR_REPORT, REPORT]
+
+        async def final_report_generation(state: AgentState):
+            output = outputs.pop(0)
+            if output is ERROR_REPORT:
+                leader_started.set()
+                await release_leader.wait()
+            return output
+
+        builder = StateGraph(AgentState)
+        builder.add_node("final_report_generation", final_report_generation)
+        builder.add_edge(START, "final_report_generation")
+        builder.add_edge("final_report_generation", END)
+        agent = DeepResearchAgent(create_chat_config(), llm=None)
+        agent.graph = builder.compile()
+
+        leader = asyncio.create_task(run(agent, "what is rag"))
+        await leader_started.wait()
+        joiner_events = agent.stream_response("what is rag", SimpleNamespace(messages=[]))
+        joiner_progress = [(await anext(joiner_events))["data"]["message"] for _ in range(2)]
+        release_leader.set()
+
+        assert ERROR_REPORT["final_report"] in await leader
+        joined = [event["data"] async for event in joiner_events if event["type"] == "content"]
+        assert "Joining" in joiner_progress[-1]
+        assert ERROR_REPORT["final_report"] not in joined
+        assert "Full report" in joined
@@ -0,0 +1,84 @@
+"""
+Test suite for the Deep Research semantic cache.
+
+This module tests:
+- Similarity matching at the configured threshold
+- Isolation of entries by conversation context
+- LRU eviction and expiry
+"""
+
+import math
+
+import pytest
+from src.backends.agents.deep_research.cache import SemanticCache, context_hash
+
+
+def unit(x: float) -> list[float]:
+    """A 2D unit vector whose dot product with [1, 0] is `x`."""
+    return [x, math.sqrt(1 - x * x)]
+
+
+class TestSemanticCache:
+    """Test suite for the embedding-matched result cache."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a cache with a fixed threshold and no embedder."""
+        return SemanticCache(embedder=None, threshold=0.9, maxsize=2)
+
+    @pytest.mark.asyncio
+    async def test_hit_at_threshold_and_miss_below(self, cache):
+        """Test that similarity equal to the threshold hits and anything lower misses."""
+        await cache.store([1.0, 0.0], "ctx", {"final_report": "report"})
+
+        assert await cache.lookup(unit(0.9), "ctx") == {"final_report": "report"}
+        assert await cache.lookup(unit(0.89), "ctx") is None
+
+    @pytest.mark.asyncio
+    async def test_entries_are_isolated_by_context_hash(self, cache):
+        """Test that an identical question in another context does not match."""
+        await cache.store([1.0, 0.0], "ctx-a", {"final_report": "a"})
+
+        assert await cache.lookup([1.0, 0.0], "ctx-b") is None
+        assert await cache.lookup([1.0, 0.0], "ctx-a") == {"final_report": "a"}
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used_context(self, cache):
+        """Test that the least recently used context is dropped once maxsize is exceeded."""
+        await cache.store([1.0, 0.0], "first", {"final_report": "1"})
+        await cache.store([1.0, 0.0], "second", {"final_report": "2"})
+        assert await cache.lookup([1.0, 0.0], "first")  # "second" is now least recently used
+
+        await cache.store([1.0, 0.0], "third", {"final_report": "3"})
+
+        assert await cache.lookup([1.0, 0.0], "second") is None
+        assert await cache.lookup([1.0, 0.0], "first") == {"final_report": "1"}
+        assert await cache.lookup([1.0, 0.0], "third") == {"final_report": "3"}
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_not_returned(self):
+        """Test that entries past their ttl are treated as misses."""
+        cache = SemanticCache(embedder=None, ttl=-1)
+        await cache.store([1.0, 0.0], "ctx", {"final_report": "stale"})
+
+        assert await cache.lookup([1.0, 0.0], "ctx") is None
+
+    @pytest.mark.asyncio
+    async def test_embed_normalizes_the_vector(self):
+        """Test that embeddings are scaled to unit length so dot products are cosines."""
+        cache = SemanticCache(embedder=lambda texts: [[3.0, 4.0]])
+
+        assert await cache.embed("  question  ") == [0.6, 0.8]
+
+
+class TestContextHash:
+    """Test suite for the cache context key."""
+
+    def test_depends_on_model_owner_and_recent_messages(self):
+        """Test that changing any scoping input changes the hash."""
+        base = context_hash("model", "user", ["hello"])
+
+        assert base == context_hash("model", "user", ["hello"])
+        assert base != context_hash("other", "user", ["hello"])
+        assert base != context_hash("model", "someone", ["hello"])
+        assert base != context_hash("model", "user", ["bye"])
@@ -0,0 +1,94 @@
+"""
+Test suite for the Deep Research graph helpers.
+
+This module tests:
+- Trimming of researcher and supervisor message histories
+- Packing of research notes into chunks for condensation
+- Context-window recovery when compressing research
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import litellm
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from src.backends.agents.deep_research import graph
+from src.backends.agents.deep_research.graph import _chunk_notes, trim_message_history
+
+
+def tool_turn(n: int) -> list:
+    """An AI tool call followed by its tool result."""
+    return [AIMessage(content=f"call {n}"), ToolMessage(content=f"result {n}", tool_call_id=str(n))]
+
+
+class TestTrimMessageHistory:
+    """Test suite for history trimming."""
+
+    def test_keeps_prompt_and_last_turns(self):
+        """Test that the leading prompt and the last `window` AI turns are kept whole."""
+        head = [SystemMessage(content="system"), HumanMessage(content="topic")]
+        messages = head + tool_turn(1) + tool_turn(2) + tool_turn(3)
+
+        assert trim_message_history(messages, 2) == head + tool_turn(2) + tool_turn(3)
+
+    def test_short_history_is_unchanged(self):
+        """Test that histories within the window are returned as-is."""
+        messages = [HumanMessage(content="topic")] + tool_turn(1) + tool_turn(2)
+
+        assert trim_message_history(messages, 2) == messages
+        assert trim_message_history(messages, 5) == messages
+
+    def test_non_positive_window_disables_trimming(self):
+        """Test that a window of zero keeps the full history."""
+        messages = [HumanMessage(content="topic")] + tool_turn(1) + tool_turn(2)
+
+        assert trim_message_history(messages, 0) is messages
+
+
+class TestChunkNotes:
+    """Test suite for note packing."""
+
+    def test_packs_notes_up_to_the_limit(self):
+        """Test that whole notes share a chunk while they fit, newline included."""
+        assert _chunk_notes(["aaaa", "bbbb", "cccc"], 10) == ["aaaa\nbbbb", "cccc"]
+
+    def test_splits_notes_longer_than_a_chunk(self):
+        """Test that an oversized note is split into chunk-sized pieces."""
+        chunks = _chunk_notes(["x" * 25], 10)
+
+        assert chunks == ["x" * 10, "x" * 10, "x" * 5]
+
+    def test_chunks_never_exceed_the_limit(self):
+        """Test that mixed note sizes always pack within the limit and keep all text."""
+        notes = ["a" * 3, "b" * 17, "c" * 8, "d"]
+        chunks = _chunk_notes(notes, 8)
+
+        assert all(len(chunk) <= 8 for chunk in chunks)
+        assert "".join(chunks).replace("\n", "") == "".join(notes)
+
+    def test_no_notes_gives_no_chunks(self):
+        """Test that an empty note list produces nothing to summarize."""
+        assert _chunk_notes([], 10) == []
+
+
+class TestCompressResearch:
+    """Test suite for context-window recovery in the compression node."""
+
+    @pytest.mark.asyncio
+    async def test_context_window_error_trims_the_history(self):
+        """Test that a context-window error retries with the history cut back to the last AI turn."""
+        overflow = litellm.ContextWindowExceededError(
+            message="This model's maximum context length is 8192 tokens", model="fake", llm_provider="openai"
+        )
+        model = AsyncMock()
+        model.ainvoke.side_effect = [overflow, AIMessage(content="compressed")]
+        messages = [HumanMessage(content="topic")] + tool_turn(1) + tool_turn(2)
+        config = {"configurable": {"cache_llm_responses": False}}
+
+        with patch.object(graph, "get_llm_for_task", return_value=model):
+            result = await graph.compress_research({"researcher_messages": messages}, config)
+
+        assert result["compressed_research"] == "compressed"
+        retried_prompt = model.ainvoke.await_args_list[1].args[0]
+        assert "call 1" not in [message.content for message in retried_prompt]
+        assert "call 2" in [message.content for message in retried_prompt]
@@ -0,0 +1,63 @@
+"""
+Test suite for the Deep Research final report generation.
+
+This module tests how the report node recovers from a prompt that overflows
+the model's context window.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import litellm
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from src.backends.agents.deep_research import graph
+
+
+class OverflowingChatModel(BaseChatModel):
+    """Chat model that rejects any prompt containing the raw notes."""
+
+    raw_marker: str
+    prompts: list = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "overflowing-fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=""))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt = messages[-1].content
+        self.prompts.append(prompt)
+        if self.raw_marker in prompt:
+            raise litellm.ContextWindowExceededError(
+                message="This model's maximum context length is 8192 tokens",
+                model="fake",
+                llm_provider="openai",
+            )
+        yield ChatGenerationChunk(message=AIMessageChunk(content="Final report"))
+
+
+class TestFinalReportGeneration:
+    """Test suite for context-window recovery in the final report node."""
+
+    @pytest.mark.asyncio
+    async def test_context_window_error_condenses_notes(self):
+        """Test that a context-window error condenses the notes instead of truncating them."""
+        notes = ["RAW NOTE one", "RAW NOTE two"]
+        llm = OverflowingChatModel(raw_marker="RAW NOTE", prompts=[])
+        config = {"configurable": {"llm_instance": llm}}
+        state = {"notes": notes, "research_brief": "brief", "messages": []}
+
+        map_reduce = AsyncMock(return_value="condensed findings")
+        with patch.object(graph, "_map_reduce_notes", map_reduce), \
+                patch.object(graph, "get_stream_writer", return_value=lambda chunk: None):
+            result = await graph.final_report_generation(state, config)
+
+        map_reduce.assert_awaited_once_with(notes, "brief", config)
+        assert result["final_report"] == "Final report"
+        assert "final_report_partial" not in result
+        assert len(llm.prompts) == 2
+        assert "condensed findings" in llm.prompts[-1]
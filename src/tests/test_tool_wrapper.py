@@ -0,0 +1,46 @@
+"""
+Test suite for the Deep Research tool wrapper.
+
+This module tests normalization of tool calls emitted by models without native tool support.
+"""
+
+from src.backends.agents.deep_research.tool_wrapper import normalize_tool_calls
+
+
+class TestNormalizeToolCalls:
+    """Test suite for tool-call normalization."""
+
+    def test_dict_args_are_kept(self):
+        """Test that already-parsed arguments pass through with a generated id."""
+        [call] = normalize_tool_calls([{"name": "search", "args": {"query": "rag"}}])
+
+        assert call == {"id": "call_0", "name": "search", "args": {"query": "rag"}}
+
+    def test_json_string_args_are_parsed(self):
+        """Test that JSON object strings become argument dicts."""
+        calls = normalize_tool_calls([
+            {"id": "a", "name": "search", "args": '{"query": "rag"}'},
+            {"id": "b", "name": "think_tool", "args": "{}"},
+        ])
+
+        assert [call["args"] for call in calls] == [{"query": "rag"}, {}]
+
+    def test_plain_string_args_are_wrapped(self):
+        """Test that non-object strings are wrapped under a single argument."""
+        calls = normalize_tool_calls([
+            {"name": "search", "args": "not json"},
+            {"name": "search", "args": "[1, 2]"},
+            {"name": "ConductResearch", "args": "history of rag"},
+        ])
+
+        assert [call["args"] for call in calls] == [
+            {"text": "not json"},
+            {"text": "[1, 2]"},
+            {"research_topic": "history of rag"},
+        ]
+
+    def test_research_topic_is_filled_from_a_single_argument(self):
+        """Test that ConductResearch gets a research_topic from its only argument."""
+        [call] = normalize_tool_calls([{"name": "ConductResearch", "args": '{"topic": "rag"}'}])
+
+        assert call["args"]["research_topic"] == "rag"